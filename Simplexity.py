@@ -3,8 +3,22 @@ import subprocess
 import importlib
 import re
 import math
+import bisect
+import ctypes
+import dis
+import gc
+import heapq
+import inspect
 import json
 import os
+import random
+import shlex
+import shutil
+import struct
+import time
+import tracemalloc
+import unicodedata
+from collections import Counter, OrderedDict
 
 required_modules = [
     "PyQt6",
@@ -26,15 +40,25 @@ def install_missing_packages():
 
 install_missing_packages()
 
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import urllib.parse
 import webbrowser
-from PyQt6.QtCore import Qt, QTimer, QEvent, QSize, QPropertyAnimation, QEasingCurve, pyqtProperty
-from PyQt6.QtGui import QColor, QFont, QPalette, QIcon, QPainter, QPen, QBrush
+from string import Template
+from PyQt6.QtCore import (
+    Qt, QTimer, QEvent, QSize, QPropertyAnimation, QEasingCurve, pyqtProperty,
+    QObject, pyqtSignal, QAbstractListModel, QModelIndex, QFileSystemWatcher
+)
+from PyQt6.QtGui import (
+    QColor, QFont, QFontMetrics, QPalette, QIcon, QPainter, QPen, QBrush,
+    QLinearGradient, QPixmap
+)
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLineEdit, QVBoxLayout, QHBoxLayout, QLabel,
     QGraphicsDropShadowEffect, QListWidget, QListWidgetItem, QDialog,
     QCheckBox, QSpinBox, QComboBox, QPushButton, QFormLayout, QTabWidget,
-    QColorDialog, QSlider, QGroupBox, QTextEdit, QButtonGroup, QRadioButton
+    QColorDialog, QSlider, QGroupBox, QTextEdit, QButtonGroup, QRadioButton,
+    QStyledItemDelegate, QStyle, QListView
 )
 
 try:
@@ -42,6 +66,11 @@ try:
 except ImportError:
     QtWin = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 try:
     import pythoncom
     import win32com.client
@@ -52,6 +81,9 @@ except ImportError:
     win32gui = None
 
 import threading
+from collections import deque
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
 import pystray
 from PIL import Image
 from pynput import keyboard
@@ -92,14 +124,20 @@ class SettingsManager:
             "prioritize_recent_apps": True,
             "exclude_system_apps": False,
             "custom_search_engines": {},
+            "search_suggestions": False,
+            "search_suggestions_url": "https://duckduckgo.com/ac/?q={query}&type=list",
 
             "enable_plugins": False,
             "auto_update_check": True,
             "performance_mode": False,
             "debug_mode": False,
+            "memory_diagnostics": False,
+            "predictive_prewarm": True,
+            "idle_trim_minutes": 10,
             "custom_css": "",
         }
         self.settings = self.load_settings()
+        self.generation = 0
 
     def load_settings(self):
         try:
@@ -125,9 +163,18 @@ class SettingsManager:
         return self.settings.get(key, self.default_settings.get(key))
 
     def set(self, key, value):
+        if self.settings.get(key) != value:
+            self.generation += 1
         self.settings[key] = value
         self.save_settings()
 
+    def update(self, changes):
+        if not changes:
+            return
+        self.settings.update(changes)
+        self.generation += 1
+        self.save_settings()
+
 class SettingsDialog(QDialog):
     def __init__(self, settings_manager, parent=None):
         super().__init__(parent)
@@ -273,30 +320,30 @@ class SettingsDialog(QDialog):
             }
         """)
 
+        self.bindings = {}
         self.setup_ui()
-        self.load_current_settings()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
-        tabs = QTabWidget()
-
-        general_tab = self.create_general_tab()
-        tabs.addTab(general_tab, "General")
-
-        appearance_tab = self.create_appearance_tab()
-        tabs.addTab(appearance_tab, "Appearance")
-
-        hotkeys_tab = self.create_hotkeys_tab()
-        tabs.addTab(hotkeys_tab, "Hotkeys")
-
-        search_tab = self.create_search_tab()
-        tabs.addTab(search_tab, "Search")
-
-        advanced_tab = self.create_advanced_tab()
-        tabs.addTab(advanced_tab, "Advanced")
+        self.tabs = QTabWidget()
+        self.tab_builders = [
+            self.create_general_tab,
+            self.create_appearance_tab,
+            self.create_hotkeys_tab,
+            self.create_search_tab,
+            self.create_advanced_tab,
+        ]
+        self.built_tabs = set()
+        for title in ("General", "Appearance", "Hotkeys", "Search", "Advanced"):
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(page, title)
+        self.tabs.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.tabs.currentIndex())
 
-        layout.addWidget(tabs)
+        layout.addWidget(self.tabs)
 
         button_layout = QHBoxLayout()
 
@@ -324,6 +371,30 @@ class SettingsDialog(QDialog):
 
         layout.addLayout(button_layout)
 
+    def ensure_tab(self, index):
+        if index < 0 or index in self.built_tabs:
+            return
+        self.built_tabs.add(index)
+        keys_before = set(self.bindings)
+        self.tabs.widget(index).layout().addWidget(self.tab_builders[index]())
+        self.load_current_settings(set(self.bindings) - keys_before)
+
+    def bind(self, key, getter, setter):
+        self.bindings[key] = (getter, setter)
+
+    def bind_check(self, key, check):
+        self.bind(key, check.isChecked, check.setChecked)
+
+    def bind_value(self, key, widget):
+        self.bind(key, widget.value, widget.setValue)
+
+    def bind_combo(self, key, combo):
+        def select(text):
+            index = combo.findText(text)
+            if index >= 0:
+                combo.setCurrentIndex(index)
+        self.bind(key, combo.currentText, select)
+
     def create_general_tab(self):
         tab = QWidget()
         layout = QVBoxLayout(tab)
@@ -367,6 +438,16 @@ class SettingsDialog(QDialog):
         layout.addWidget(features_group)
         layout.addStretch()
 
+        self.bind_value("auto_hide_delay", self.auto_hide_spin)
+        self.bind_value("max_results", self.max_results_spin)
+        self.bind_check("show_math_calculator", self.math_calc_check)
+        self.bind_check("show_perplexity_search", self.perplexity_check)
+        self.bind_check("show_file_search", self.file_search_check)
+        self.bind_check("show_icons", self.show_icons_check)
+        self.bind_check("auto_launch_on_startup", self.auto_launch_check)
+        self.bind_check("close_after_launch", self.close_after_launch_check)
+        self.bind_check("remember_window_position", self.remember_position_check)
+
         return tab
 
     def create_appearance_tab(self):
@@ -399,6 +480,7 @@ class SettingsDialog(QDialog):
         self.font_size_spin.setSuffix(" pt")
         visual_layout.addRow("Font size:", self.font_size_spin)
 
+        self.accent_color = None
         self.accent_color_btn = QPushButton("Choose Accent Color")
         self.accent_color_btn.clicked.connect(self.choose_accent_color)
         visual_layout.addRow("Accent color:", self.accent_color_btn)
@@ -429,6 +511,14 @@ class SettingsDialog(QDialog):
             lambda v: self.animation_speed_label.setText(f"{v}ms")
         )
 
+        self.bind_value("launcher_opacity", self.opacity_slider)
+        self.bind_value("launcher_width", self.width_spin)
+        self.bind_value("launcher_height", self.height_spin)
+        self.bind_value("font_size", self.font_size_spin)
+        self.bind("theme_accent_color", lambda: self.accent_color, self.set_accent_color)
+        self.bind_value("animation_speed", self.animation_speed_slider)
+        self.bind_check("blur_background", self.blur_background_check)
+
         return tab
 
     def create_hotkeys_tab(self):
@@ -446,7 +536,8 @@ class SettingsDialog(QDialog):
             "Ctrl+Shift+Space",
             "Alt+Shift+Space",
             "Ctrl+Alt+Space",
-            "F1", "F2", "F3", "F4"
+            "F1", "F2", "F3", "F4",
+            "Custom"
         ])
         hotkey_layout.addRow("Launch hotkey:", self.hotkey_combo)
 
@@ -496,8 +587,22 @@ class SettingsDialog(QDialog):
         layout.addWidget(modifier_group)
         layout.addStretch()
 
+        self.bind_combo("hotkey_combination", self.hotkey_combo)
+        self.bind_check("enable_double_ctrl", self.double_ctrl_check)
+        self.bind_combo("hotkey_key", self.key_combo)
+        self.bind("hotkey_modifier", self.checked_modifier, self.check_modifier)
+
         return tab
 
+    def checked_modifier(self):
+        button = self.modifier_group.checkedButton()
+        return button.text() if button else self.settings_manager.get("hotkey_modifier")
+
+    def check_modifier(self, modifier):
+        for button in self.modifier_group.buttons():
+            if button.text() == modifier:
+                button.setChecked(True)
+
     def create_search_tab(self):
         tab = QWidget()
         layout = QVBoxLayout(tab)
@@ -528,9 +633,20 @@ class SettingsDialog(QDialog):
         ])
         web_layout.addRow("Default search engine:", self.search_engine_combo)
 
+        self.suggestions_check = QCheckBox("Show live search suggestions")
+        web_layout.addRow(self.suggestions_check)
+
         layout.addWidget(web_group)
         layout.addStretch()
 
+        self.bind_check("enable_fuzzy_search", self.fuzzy_search_check)
+        self.bind_check("search_case_sensitive", self.case_sensitive_check)
+        self.bind_check("prioritize_recent_apps", self.prioritize_recent_check)
+        self.bind_check("exclude_system_apps", self.exclude_system_check)
+        self.bind_check("search_include_descriptions", self.include_descriptions_check)
+        self.bind_combo("search_web_engine", self.search_engine_combo)
+        self.bind_check("search_suggestions", self.suggestions_check)
+
         return tab
 
     def create_advanced_tab(self):
@@ -542,9 +658,22 @@ class SettingsDialog(QDialog):
 
         self.performance_mode_check = QCheckBox("Performance mode (reduced animations)")
         self.debug_mode_check = QCheckBox("Enable debug mode")
+        self.memory_diagnostics_check = QCheckBox("Memory diagnostics (slower, use the 'memory' command)")
+        self.prewarm_check = QCheckBox("Pre-load the top result's program while typing")
 
         performance_layout.addWidget(self.performance_mode_check)
         performance_layout.addWidget(self.debug_mode_check)
+        performance_layout.addWidget(self.memory_diagnostics_check)
+        performance_layout.addWidget(self.prewarm_check)
+
+        idle_layout = QHBoxLayout()
+        idle_layout.addWidget(QLabel("Free caches after hidden for:"))
+        self.idle_trim_spin = QSpinBox()
+        self.idle_trim_spin.setRange(0, 1440)
+        self.idle_trim_spin.setSuffix(" min")
+        self.idle_trim_spin.setSpecialValueText("Never")
+        idle_layout.addWidget(self.idle_trim_spin)
+        performance_layout.addLayout(idle_layout)
 
         layout.addWidget(performance_group)
 
@@ -560,55 +689,31 @@ class SettingsDialog(QDialog):
         layout.addWidget(css_group)
         layout.addStretch()
 
+        self.bind_check("performance_mode", self.performance_mode_check)
+        self.bind_check("debug_mode", self.debug_mode_check)
+        self.bind_check("memory_diagnostics", self.memory_diagnostics_check)
+        self.bind_check("predictive_prewarm", self.prewarm_check)
+        self.bind_value("idle_trim_minutes", self.idle_trim_spin)
+        self.bind("custom_css", self.custom_css_edit.toPlainText, self.custom_css_edit.setPlainText)
+
         return tab
 
-    def load_current_settings(self):
-
-        self.auto_hide_spin.setValue(self.settings_manager.get("auto_hide_delay"))
-        self.max_results_spin.setValue(self.settings_manager.get("max_results"))
-        self.math_calc_check.setChecked(self.settings_manager.get("show_math_calculator"))
-        self.perplexity_check.setChecked(self.settings_manager.get("show_perplexity_search"))
-        self.file_search_check.setChecked(self.settings_manager.get("show_file_search"))
-        self.show_icons_check.setChecked(self.settings_manager.get("show_icons"))
-        self.auto_launch_check.setChecked(self.settings_manager.get("auto_launch_on_startup"))
-        self.close_after_launch_check.setChecked(self.settings_manager.get("close_after_launch"))
-        self.remember_position_check.setChecked(self.settings_manager.get("remember_window_position"))
-
-        self.opacity_slider.setValue(self.settings_manager.get("launcher_opacity"))
-        self.width_spin.setValue(self.settings_manager.get("launcher_width"))
-        self.height_spin.setValue(self.settings_manager.get("launcher_height"))
-        self.font_size_spin.setValue(self.settings_manager.get("font_size"))
-        self.animation_speed_slider.setValue(self.settings_manager.get("animation_speed"))
-        self.blur_background_check.setChecked(self.settings_manager.get("blur_background"))
-
-        hotkey = self.settings_manager.get("hotkey_combination")
-        index = self.hotkey_combo.findText(hotkey)
-        if index >= 0:
-            self.hotkey_combo.setCurrentIndex(index)
-
-        self.double_ctrl_check.setChecked(self.settings_manager.get("enable_double_ctrl"))
-
-        self.fuzzy_search_check.setChecked(self.settings_manager.get("enable_fuzzy_search"))
-        self.case_sensitive_check.setChecked(self.settings_manager.get("search_case_sensitive"))
-        self.prioritize_recent_check.setChecked(self.settings_manager.get("prioritize_recent_apps"))
-        self.exclude_system_check.setChecked(self.settings_manager.get("exclude_system_apps"))
-        self.include_descriptions_check.setChecked(self.settings_manager.get("search_include_descriptions"))
-
-        engine = self.settings_manager.get("search_web_engine")
-        engine_index = self.search_engine_combo.findText(engine)
-        if engine_index >= 0:
-            self.search_engine_combo.setCurrentIndex(engine_index)
-
-        self.performance_mode_check.setChecked(self.settings_manager.get("performance_mode"))
-        self.debug_mode_check.setChecked(self.settings_manager.get("debug_mode"))
-        self.custom_css_edit.setPlainText(self.settings_manager.get("custom_css"))
+    def load_current_settings(self, keys=None):
+        for key in self.bindings if keys is None else keys:
+            getter, setter = self.bindings[key]
+            value = self.settings_manager.get(key)
+            if getter() != value:
+                setter(value)
+
+    def set_accent_color(self, color):
+        self.accent_color = color
+        self.accent_color_btn.setStyleSheet(f"background-color: {color};")
 
     def choose_accent_color(self):
-        current_color = QColor(self.settings_manager.get("theme_accent_color"))
+        current_color = QColor(self.accent_color)
         color = QColorDialog.getColor(current_color, self, "Choose Accent Color")
         if color.isValid():
-            self.settings_manager.set("theme_accent_color", color.name())
-            self.accent_color_btn.setStyleSheet(f"background-color: {color.name()};")
+            self.set_accent_color(color.name())
 
     def export_settings(self):
         try:
@@ -640,51 +745,30 @@ class SettingsDialog(QDialog):
             print(f"Import failed: {e}")
 
     def reset_to_defaults(self):
-        self.settings_manager.settings = self.settings_manager.default_settings.copy()
-        self.load_current_settings()
+        for index in range(self.tabs.count()):
+            self.ensure_tab(index)
+        defaults = self.settings_manager.default_settings
+        for key, (getter, setter) in self.bindings.items():
+            if getter() != defaults[key]:
+                setter(defaults[key])
 
     def save_and_close(self):
-
-        self.settings_manager.set("auto_hide_delay", self.auto_hide_spin.value())
-        self.settings_manager.set("max_results", self.max_results_spin.value())
-        self.settings_manager.set("show_math_calculator", self.math_calc_check.isChecked())
-        self.settings_manager.set("show_perplexity_search", self.perplexity_check.isChecked())
-        self.settings_manager.set("show_file_search", self.file_search_check.isChecked())
-        self.settings_manager.set("show_icons", self.show_icons_check.isChecked())
-        self.settings_manager.set("auto_launch_on_startup", self.auto_launch_check.isChecked())
-        self.settings_manager.set("close_after_launch", self.close_after_launch_check.isChecked())
-        self.settings_manager.set("remember_window_position", self.remember_position_check.isChecked())
-
-        self.settings_manager.set("launcher_opacity", self.opacity_slider.value())
-        self.settings_manager.set("launcher_width", self.width_spin.value())
-        self.settings_manager.set("launcher_height", self.height_spin.value())
-        self.settings_manager.set("font_size", self.font_size_spin.value())
-        self.settings_manager.set("animation_speed", self.animation_speed_slider.value())
-        self.settings_manager.set("blur_background", self.blur_background_check.isChecked())
-
-        self.settings_manager.set("hotkey_combination", self.hotkey_combo.currentText())
-        self.settings_manager.set("enable_double_ctrl", self.double_ctrl_check.isChecked())
-
-        self.settings_manager.set("enable_fuzzy_search", self.fuzzy_search_check.isChecked())
-        self.settings_manager.set("search_case_sensitive", self.case_sensitive_check.isChecked())
-        self.settings_manager.set("prioritize_recent_apps", self.prioritize_recent_check.isChecked())
-        self.settings_manager.set("exclude_system_apps", self.exclude_system_check.isChecked())
-        self.settings_manager.set("search_include_descriptions", self.include_descriptions_check.isChecked())
-        self.settings_manager.set("search_web_engine", self.search_engine_combo.currentText())
-
-        self.settings_manager.set("performance_mode", self.performance_mode_check.isChecked())
-        self.settings_manager.set("debug_mode", self.debug_mode_check.isChecked())
-        self.settings_manager.set("custom_css", self.custom_css_edit.toPlainText())
-
+        changes = {}
+        for key, (getter, setter) in self.bindings.items():
+            value = getter()
+            if value != self.settings_manager.get(key):
+                changes[key] = value
+        self.settings_manager.update(changes)
         self.accept()
 
-def find_start_menu_apps():
-    apps = []
-    start_dirs = [
+def start_menu_dirs():
+    return [
         os.path.join(os.environ.get('APPDATA', ''), r'Microsoft\Windows\Start Menu\Programs'),
         os.path.join(os.environ.get('PROGRAMDATA', ''), r'Microsoft\Windows\Start Menu\Programs')
     ]
-    for start_dir in start_dirs:
+
+def iter_start_menu_apps():
+    for start_dir in start_menu_dirs():
         if not os.path.exists(start_dir):
             continue
         for root, dirs, files in os.walk(start_dir):
@@ -692,59 +776,2060 @@ def find_start_menu_apps():
                 if file.lower().endswith('.lnk'):
                     path = os.path.join(root, file)
                     name = file[:-4]
-                    apps.append((name, path))
-    return apps
+                    yield name, path
+
+def xdg_application_dirs():
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+    dirs = [data_home] + [d for d in data_dirs.split(':') if d]
+    return [os.path.join(d, 'applications') for d in dirs]
+
+DESKTOP_ENTRY_KEYS = {"Name", "Exec", "Type", "Comment", "NoDisplay", "Hidden", "Terminal"}
+
+def parse_desktop_entry(path):
+    """Read only the needed keys of the [Desktop Entry] group, stopping at the next group"""
+    entry = {}
+    in_group = False
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line.startswith('['):
+                if in_group:
+                    break
+                in_group = line.strip() == '[Desktop Entry]'
+                continue
+            if not in_group:
+                continue
+            key, sep, value = line.partition('=')
+            key = key.strip()
+            if sep and key in DESKTOP_ENTRY_KEYS and key not in entry:
+                entry[key] = value.strip()
+    return entry
+
+def desktop_entry_visible(entry):
+    return (entry.get("Type", "Application") == "Application" and bool(entry.get("Name"))
+            and bool(entry.get("Exec")) and entry.get("NoDisplay", "").lower() != "true"
+            and entry.get("Hidden", "").lower() != "true")
+
+DESKTOP_FIELD_CODES = {"%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m"}
+
+def desktop_exec_argv(exec_line):
+    try:
+        args = shlex.split(exec_line)
+    except ValueError:
+        args = exec_line.split()
+    return [arg.replace("%%", "%") for arg in args if arg not in DESKTOP_FIELD_CODES]
+
+def desktop_entry_metadata(entry):
+    argv = desktop_exec_argv(entry.get("Exec", ""))
+    return {
+        "target": argv[0] if argv else "",
+        "arguments": " ".join(argv[1:]),
+        "description": entry.get("Comment", ""),
+        "working_dir": "",
+    }
 
-def evaluate_math_expression(expr):
-    """Safely evaluate mathematical expressions"""
+def iter_desktop_apps(metadata_store=None, max_workers=8):
+    paths = []
+    seen_ids = set()
+    for app_dir in xdg_application_dirs():
+        if not os.path.isdir(app_dir):
+            continue
+        for root, dirs, files in os.walk(app_dir):
+            for file in files:
+                if not file.endswith('.desktop'):
+                    continue
+                path = os.path.join(root, file)
+                desktop_id = os.path.relpath(path, app_dir).replace(os.sep, '-')
+                if desktop_id not in seen_ids:
+                    seen_ids.add(desktop_id)
+                    paths.append(path)
+    if not paths:
+        return
+
+    def parse(path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            return path, mtime, parse_desktop_entry(path)
+        except OSError:
+            return path, None, {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="desktop") as pool:
+        for path, mtime, entry in pool.map(parse, paths):
+            if not desktop_entry_visible(entry):
+                continue
+            if metadata_store is not None:
+                metadata_store(path, mtime, desktop_entry_metadata(entry))
+            yield entry["Name"], path
+
+def catalog_dirs():
+    return start_menu_dirs() + xdg_application_dirs()
+
+def iter_catalog_apps(metadata_store=None):
+    yield from iter_start_menu_apps()
+    yield from iter_desktop_apps(metadata_store)
+
+HELPER_SHORTCUT_RE = re.compile(
+    r"^uninstall\b[\s\-:]*|[\s\-:]+(?:uninstall(?:er)?|read ?me|(?:online )?documentation)$",
+    re.IGNORECASE
+)
+NAME_NOISE_RE = re.compile(r"\s*(?:\((?:x64|x86|64-bit|32-bit|\d+)\)|- shortcut)\s*$", re.IGNORECASE)
+
+def canonical_name(name):
+    return " ".join(NAME_NOISE_RE.sub("", name).casefold().split())
+
+class CatalogCanonicalizer:
+    """Merges duplicate shortcuts into one primary entry as they stream in from the sources"""
+
+    def __init__(self, metadata_lookup=None):
+        self.metadata_lookup = metadata_lookup or (lambda path: None)
+        self.entries = []
+        self.by_name = {}
+        self.by_target = {}
+        self.targets = {}
+        self.pending_helpers = {}
+        self.unresolved = []
+        self.seen = 0
+
+    def target_key(self, path):
+        metadata = self.metadata_lookup(path)
+        if metadata is None:
+            self.unresolved.append(path)
+            return None
+        target = metadata.get("target")
+        if not target:
+            return None
+        return os.path.normcase(target), metadata.get("arguments", "")
+
+    def add(self, name, path):
+        self.seen += 1
+        helper_base = HELPER_SHORTCUT_RE.sub("", name)
+        if helper_base != name and helper_base:
+            base = canonical_name(helper_base)
+            primary = self.by_name.get(base)
+            if primary is not None:
+                self.entries[primary][2].append((name, path))
+                return
+            self.pending_helpers.setdefault(base, []).append(len(self.entries))
+            self.entries.append([name, path, []])
+            return
 
-    expr = expr.replace(' ', '').lower()
-
-    replacements = {
-        'pi': str(math.pi),
-        'e': str(math.e),
-        'sin': 'math.sin',
-        'cos': 'math.cos',
-        'tan': 'math.tan',
-        'sqrt': 'math.sqrt',
-        'log': 'math.log10',
-        'ln': 'math.log',
-        'abs': 'abs',
-        '^': '**',
-    }
+        key = canonical_name(name)
+        target = self.target_key(path)
+        primary = self.by_name.get(key)
+        if primary is not None and target is not None and self.targets[primary] not in (None, target):
+            primary = None
+        if primary is None and target is not None:
+            primary = self.by_target.get(target)
+        if primary is not None:
+            self.entries[primary][2].append((name, path))
+            return
 
-    for old, new in replacements.items():
-        expr = expr.replace(old, new)
+        primary = len(self.entries)
+        self.entries.append([name, path, []])
+        self.targets[primary] = target
+        self.by_name.setdefault(key, primary)
+        if target is not None:
+            self.by_target[target] = primary
+        for helper in self.pending_helpers.pop(key, ()):
+            self.entries[primary][2].append(tuple(self.entries[helper][:2]))
+            self.entries[helper] = None
+
+    def apps(self):
+        return [(entry[0], entry[1]) for entry in self.entries if entry is not None]
+
+    def aliases(self):
+        return {entry[1]: entry[2] for entry in self.entries if entry is not None and entry[2]}
+
+    def report(self):
+        kept = sum(1 for entry in self.entries if entry is not None)
+        return f"catalog: {self.seen} shortcuts -> {kept} apps ({self.seen - kept} merged as aliases)"
+
+SYSTEM_APP_FOLDERS = (
+    "accessibility", "administrative tools", "maintenance", "startup",
+    "system tools", "windows accessories", "windows administrative tools",
+    "windows powershell", "windows system", "windows tools",
+)
+SYSTEM_APP_NAME_RE = re.compile(
+    r"\b(uninstall|readme|read me|release notes|license|documentation|help)\b",
+    re.IGNORECASE
+)
 
-    if not re.match(r'^[0-9+\-*/().mathsincoqrtlgabspie\s]+$', expr):
+def is_system_app(name, path):
+    folder = os.path.basename(os.path.dirname(path)).lower()
+    return folder in SYSTEM_APP_FOLDERS or bool(SYSTEM_APP_NAME_RE.search(name))
+
+TOKEN_RE = re.compile(r"\w+")
+ALIAS_SEPARATOR = "\n"
+
+class TokenTrie:
+    """Token dictionary walked by a Levenshtein automaton for bounded edit-distance lookups"""
+
+    def __init__(self, words=()):
+        self.root = ({}, None)
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        node = self.root
+        for char in word:
+            children = node[0]
+            child = children.get(char)
+            if child is None:
+                child = children[char] = ({}, None)
+            node = child
+        node[0][None] = word
+
+    def search(self, word, max_distance, max_visits):
+        found = []
+        visits = 0
+        columns = range(1, len(word) + 1)
+        stack = [(child, char, list(range(len(word) + 1)))
+                 for char, child in self.root[0].items() if char is not None]
+        while stack and visits < max_visits:
+            node, char, previous = stack.pop()
+            visits += 1
+            row = [previous[0] + 1]
+            for j in columns:
+                row.append(min(
+                    row[j - 1] + 1,
+                    previous[j] + 1,
+                    previous[j - 1] + (word[j - 1] != char)
+                ))
+            children = node[0]
+            terminal = children.get(None)
+            if terminal is not None and row[-1] <= max_distance:
+                found.append((terminal, row[-1]))
+            if min(row) <= max_distance:
+                stack.extend(
+                    (child, next_char, row)
+                    for next_char, child in children.items() if next_char is not None
+                )
+        return found, visits
+
+class TypoIndex:
+    """Approximate token matching for a SearchView, tolerating one or two typos per word"""
+
+    min_token_length = 3
+
+    def __init__(self, keys, ids=None):
+        self.ids = ids if ids is not None else range(len(keys))
+        self.postings = {}
+        for pos, key in enumerate(keys):
+            for token in set(TOKEN_RE.findall(key)):
+                self.postings.setdefault(token, []).append(pos)
+        self.trie = TokenTrie(self.postings)
+
+    def max_distance(self, token):
+        return 1 if len(token) <= 4 else 2
+
+    def match(self, query, max_visits=3000):
+        tokens = [t for t in TOKEN_RE.findall(query) if len(t) >= self.min_token_length]
+        if not tokens:
+            return {}
+        budget = max_visits // len(tokens)
+        distances = None
+        for token in tokens:
+            found, _ = self.trie.search(token, self.max_distance(token), budget)
+            best = {}
+            for word, distance in found:
+                for pos in self.postings[word]:
+                    if distance < best.get(pos, distance + 1):
+                        best[pos] = distance
+            if distances is None:
+                distances = best
+            else:
+                distances = {
+                    pos: distances[pos] + distance
+                    for pos, distance in best.items() if pos in distances
+                }
+            if not distances:
+                return {}
+        return distances
+
+def elapsed_ms(started):
+    return (time.perf_counter() - started) * 1000
+
+WORD_PART_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[^\W\d_]+")
+
+def name_initials(name):
+    """First letter of every word, camel-case hump and digit run: 'Visual Studio Code' -> 'vsc'"""
+    return "".join(part[0] for part in WORD_PART_RE.findall(name)).lower()
+
+FOLDED_CHARS = {True: {}, False: {}}
+
+def fold_char(char, casefold=True):
+    decomposed = unicodedata.normalize("NFKD", char)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return unicodedata.normalize("NFKC", stripped.casefold() if casefold else stripped)
+
+def fold_text(text, casefold=True):
+    """Accent-stripped, NFKC search key plus the display offset of every key character
+
+    Offsets are None when the key lines up with the text one-to-one.
+    """
+    if text.isascii():
+        return (text.lower() if casefold else text), None
+    cache = FOLDED_CHARS[casefold]
+    pieces = []
+    offsets = []
+    for i, char in enumerate(text):
+        folded = cache.get(char)
+        if folded is None:
+            folded = cache[char] = fold_char(char, casefold)
+        pieces.append(folded)
+        offsets.extend([i] * len(folded))
+    key = "".join(pieces)
+    return key, (None if len(offsets) == len(text) else offsets)
+
+class SearchView:
+    """Filtered, normalised copy of the catalog for one combination of search settings"""
+
+    def __init__(self, index, case_sensitive, exclude_system):
+        self.build_times = {}
+        started = time.perf_counter()
+        self.casefold = not case_sensitive
+        self.last_query = None
+        self.last_key = None
+        self.index = index
+        self.ids = [
+            i for i in range(index.primary_count)
+            if not (exclude_system and index.system_flags[i])
+        ]
+        folded = [fold_text(index.search_text(i), self.casefold) for i in self.ids]
+        self.keys = [key for key, offsets in folded]
+        self.offsets = [offsets for key, offsets in folded]
+        self.segments = [
+            self.key_segments(key, [i] + index.alias_ids[i], exclude_system) if index.alias_ids[i] else None
+            for i, key in zip(self.ids, self.keys)
+        ]
+        self.positions = None
+        self.typo_index = None
+        self.description_keys = None
+        self.build_times["keys"] = elapsed_ms(started)
+
+        started = time.perf_counter()
+
+        self.postings = {}
+        for pos, key in enumerate(self.keys):
+            for char in set(key):
+                self.postings.setdefault(char, []).append(pos)
+        self.build_times["postings"] = elapsed_ms(started)
+
+        started = time.perf_counter()
+        self.initials = {}
+        for i in self.ids:
+            for app_id in [i] + index.alias_ids[i]:
+                if app_id != i and exclude_system and index.system_flags[app_id]:
+                    continue
+                initials = index.initials[app_id]
+                for end in range(2, len(initials) + 1):
+                    self.initials.setdefault(initials[:end], []).append(app_id)
+        self.build_times["initials"] = elapsed_ms(started)
+
+    def key_segments(self, key, app_ids, exclude_system):
+        """(start, end, app_id) for the name and each alias inside a combined key; None for filtered aliases"""
+        segments = []
+        start = 0
+        for part, app_id in zip(key.split(ALIAS_SEPARATOR), app_ids):
+            if segments and exclude_system and self.index.system_flags[app_id]:
+                app_id = None
+            segments.append((start, start + len(part), app_id))
+            start += len(part) + 1
+        return segments
+
+    def segment_id(self, pos, start):
+        """The entry, primary or alias, whose part of the key a match starting at `start` falls in"""
+        segments = self.segments[pos]
+        if segments is None:
+            return self.ids[pos]
+        for segment_start, segment_end, app_id in segments:
+            if start <= segment_end:
+                return app_id
         return None
 
+    def normalise(self, text):
+        return fold_text(text, self.casefold)[0]
+
+    def trim(self):
+        """Drop the lazily built tiers; keys, postings and initials stay for the first keystroke"""
+        self.typo_index = None
+        self.description_keys = None
+        self.positions = None
+        self.last_query = self.last_key = None
+
+    def query_key(self, query):
+        """Folded query, computed once per keystroke however many match tiers ask for it"""
+        if query != self.last_query:
+            self.last_key = self.normalise(query)
+            self.last_query = query
+        return self.last_key
+
+    def display_span(self, pos, start, end):
+        """Map a [start, end) slice of a folded key back to the display name"""
+        offsets = self.offsets[pos]
+        if offsets is None:
+            return start, end
+        return offsets[start], offsets[end - 1] + 1
+
+    def highlight(self, app_id, query):
+        """Display-name span of the query inside an entry's own name, or None"""
+        if self.positions is None:
+            self.positions = {}
+            for pos, key in enumerate(self.keys):
+                for start, end, segment_id in self.segments[pos] or [(0, len(key), self.ids[pos])]:
+                    self.positions[segment_id] = (pos, start, end)
+        located = self.positions.get(app_id)
+        query = self.query_key(query)
+        if located is None or not query:
+            return None
+        pos, segment_start, segment_end = located
+        start = self.keys[pos].find(query, segment_start, segment_end)
+        if start < 0:
+            return None
+        offset = self.display_span(pos, segment_start, segment_start + 1)[0] if segment_start else 0
+        start, end = self.display_span(pos, start, start + len(query))
+        return start - offset, end - offset
+
+    def iter_name_matches(self, query):
+        """Resumable walk over the name matches, in catalog order"""
+        query = self.query_key(query)
+        candidates = None
+        for char in set(query):
+            posting = self.postings.get(char)
+            if posting is None:
+                return
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        if candidates is None:
+            return
+
+        keys = self.keys
+        ids = self.ids
+        segments = self.segments
+        for pos in candidates:
+            key = keys[pos]
+            start = key.find(query)
+            if start >= 0:
+                if start == 0 or key[start - 1] == ALIAS_SEPARATOR:
+                    end = start + len(query)
+                    score = 1.0 if end == len(key) or key[end] == ALIAS_SEPARATOR else 0.8
+                else:
+                    score = 0.5
+                app_id = ids[pos] if segments[pos] is None else self.segment_id(pos, start)
+                if app_id is not None:
+                    yield app_id, score
+
+    def match(self, query, limit=None):
+        return list(islice(self.iter_name_matches(query), limit))
+
+    def match_initials(self, query, exclude, limit=None):
+        """Full-initials hits first, then prefix hits, each in catalog order"""
+        query = fold_text(query.replace(" ", ""))[0]
+        full = []
+        partial = []
+        for app_id in self.initials.get(query, ()):
+            if app_id not in exclude:
+                if len(query) == len(self.index.initials[app_id]):
+                    full.append((app_id, 0.7))
+                else:
+                    partial.append((app_id, 0.6))
+        return (full + partial)[:limit]
+
+    def prepare(self, typos, descriptions):
+        """Build the lazy tiers up front so the first keystroke after a change doesn't pay for them"""
+        if typos and self.typo_index is None:
+            started = time.perf_counter()
+            self.typo_index = self.build_typo_index()
+            self.build_times["typos"] = elapsed_ms(started)
+        if descriptions and self.description_keys is None:
+            started = time.perf_counter()
+            self.build_description_keys()
+            self.build_times["descriptions"] = elapsed_ms(started)
+
+    def build_typo_index(self):
+        """TypoIndex over each name and alias on its own, so a typo hit maps to the entry it was in
+
+        Aliases only keep the words their primary lacks, so 'Uninstall Foo' is found by 'unistall' but
+        a typo of 'foo' still finds just Foo.
+        """
+        keys = []
+        ids = []
+        for pos, key in enumerate(self.keys):
+            segments = self.segments[pos]
+            if segments is None:
+                keys.append(key)
+                ids.append(self.ids[pos])
+                continue
+            primary_tokens = set(TOKEN_RE.findall(key[segments[0][0]:segments[0][1]]))
+            for start, end, app_id in segments:
+                if app_id is None:
+                    continue
+                tokens = TOKEN_RE.findall(key[start:end])
+                if app_id != self.ids[pos]:
+                    tokens = [token for token in tokens if token not in primary_tokens]
+                keys.append(" ".join(tokens))
+                ids.append(app_id)
+        return TypoIndex(keys, ids)
+
+    def build_description_keys(self):
+        """Token -> positions index over the folded descriptions, with the tokens sorted for prefix scans"""
+        descriptions = self.index.descriptions
+        postings = {}
+        for pos, i in enumerate(self.ids):
+            if descriptions[i]:
+                for token in set(TOKEN_RE.findall(self.normalise(descriptions[i]))):
+                    postings.setdefault(token, []).append(pos)
+        self.description_keys = (sorted(postings), postings)
+
+    def match_descriptions(self, query, exclude, limit):
+        """Entries whose description has a word starting with every query word"""
+        if self.description_keys is None:
+            self.build_description_keys()
+        tokens, postings = self.description_keys
+        candidates = None
+        for word in set(TOKEN_RE.findall(self.query_key(query))):
+            positions = set()
+            i = bisect.bisect_left(tokens, word)
+            while i < len(tokens) and tokens[i].startswith(word):
+                positions.update(postings[tokens[i]])
+                i += 1
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return []
+        if candidates is None:
+            return []
+        matched = [(self.ids[pos], 0.4) for pos in sorted(candidates) if self.ids[pos] not in exclude]
+        return matched[:limit]
+
+    def match_typos(self, query, exclude, limit):
+        if self.typo_index is None:
+            self.typo_index = self.build_typo_index()
+        distances = self.typo_index.match(self.query_key(query))
+        ids = self.typo_index.ids
+        matched = sorted(
+            (distance, pos) for pos, distance in distances.items()
+            if ids[pos] not in exclude
+        )
+        return [(ids[pos], 0.3 - 0.05 * distance) for distance, pos in matched[:limit]]
+
+class SearchIndex:
+    def __init__(self, apps):
+        self.generation = 0
+        self.rebuild(apps)
+
+    def rebuild(self, apps, aliases=None):
+        self.build_times = {}
+        started = time.perf_counter()
+        self.names = [name for name, path in apps]
+        self.paths = [path for name, path in apps]
+        self.primary_count = len(self.names)
+        aliases = aliases or {}
+        self.alias_ids = []
+        for name, path in apps:
+            primary = canonical_name(name)
+            ids = []
+            for alias, alias_path in aliases.get(path, ()):
+                if canonical_name(alias) != primary:
+                    ids.append(len(self.names))
+                    self.names.append(alias)
+                    self.paths.append(alias_path)
+            self.alias_ids.append(ids)
+        self.path_ids = {path: i for i, path in enumerate(self.paths)}
+        self.system_flags = [is_system_app(name, path) for name, path in zip(self.names, self.paths)]
+        self.build_times["catalog"] = elapsed_ms(started)
+
+        started = time.perf_counter()
+        self.initials = [fold_text(name_initials(name))[0] for name in self.names]
+        self.build_times["initials"] = elapsed_ms(started)
+
+        self.descriptions = [""] * len(self.names)
+        self.views = {}
+        self.generation += 1
+
+    def search_text(self, i):
+        """Display name followed by the merged alias names, one per line, as the name tiers see it"""
+        if not self.alias_ids[i]:
+            return self.names[i]
+        return ALIAS_SEPARATOR.join(self.names[j] for j in [i] + self.alias_ids[i])
+
+    def set_metadata(self, metadata):
+        self.descriptions = [
+            metadata.get(path, {}).get("description", "") for path in self.paths
+        ]
+        for view in self.views.values():
+            view.description_keys = None
+        self.generation += 1
+
+    def view(self, case_sensitive, exclude_system):
+        key = (bool(case_sensitive), bool(exclude_system))
+        view = self.views.get(key)
+        if view is None:
+            view = self.views[key] = SearchView(self, *key)
+        return view
+
+    def trim(self, keep):
+        self.views = {key: view for key, view in self.views.items() if view is keep}
+        keep.trim()
+
+    def build_report(self, view):
+        parts = [f"{name}={ms:.1f}ms" for name, ms in self.build_times.items()]
+        parts += [f"view.{name}={ms:.1f}ms" for name, ms in view.build_times.items()]
+        return f"index of {self.primary_count} apps ({len(view.ids)} in view): {', '.join(parts)}"
+
+LNK_HAS_ID_LIST = 0x01
+LNK_HAS_LINK_INFO = 0x02
+LNK_HAS_NAME = 0x04
+LNK_HAS_RELATIVE_PATH = 0x08
+LNK_HAS_WORKING_DIR = 0x10
+LNK_HAS_ARGUMENTS = 0x20
+LNK_HAS_ICON_LOCATION = 0x40
+LNK_IS_UNICODE = 0x80
+LNK_ENVIRONMENT_BLOCK = 0xA0000001
+
+def read_c_string(data, offset, unicode=False):
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[offset:end].decode("utf-16-le", errors="replace")
+    end = data.find(b"\0", offset)
+    if end < 0:
+        end = len(data)
+    return data[offset:end].decode("mbcs" if os.name == "nt" else "latin-1", errors="replace")
+
+def parse_lnk(data):
+    """Parse a Shell Link (.lnk) file from raw bytes without going through COM"""
+    if len(data) < 0x4C or struct.unpack_from("<I", data, 0)[0] != 0x4C:
+        raise ValueError("not a shell link")
+    flags = struct.unpack_from("<I", data, 0x14)[0]
+    offset = 0x4C
+    metadata = {"target": "", "description": "", "arguments": "", "working_dir": ""}
+
+    if flags & LNK_HAS_ID_LIST:
+        offset += 2 + struct.unpack_from("<H", data, offset)[0]
+
+    if flags & LNK_HAS_LINK_INFO:
+        info_size, header_size, info_flags = struct.unpack_from("<III", data, offset)
+        if info_flags & 0x01:
+            base_offset, _, suffix_offset = struct.unpack_from("<III", data, offset + 16)
+            target = read_c_string(data, offset + base_offset)
+            suffix = read_c_string(data, offset + suffix_offset) if suffix_offset else ""
+            if header_size >= 0x24:
+                base_unicode, suffix_unicode = struct.unpack_from("<II", data, offset + 28)
+                if base_unicode:
+                    target = read_c_string(data, offset + base_unicode, unicode=True)
+                if suffix_unicode:
+                    suffix = read_c_string(data, offset + suffix_unicode, unicode=True)
+            metadata["target"] = target + suffix
+        offset += info_size
+
+    unicode = bool(flags & LNK_IS_UNICODE)
+    for flag, key in ((LNK_HAS_NAME, "description"), (LNK_HAS_RELATIVE_PATH, "relative_path"),
+                      (LNK_HAS_WORKING_DIR, "working_dir"), (LNK_HAS_ARGUMENTS, "arguments"),
+                      (LNK_HAS_ICON_LOCATION, "icon")):
+        if flags & flag:
+            count = struct.unpack_from("<H", data, offset)[0]
+            offset += 2
+            size = count * 2 if unicode else count
+            raw = data[offset:offset + size]
+            metadata[key] = raw.decode("utf-16-le" if unicode else "latin-1", errors="replace")
+            offset += size
+
+    while not metadata["target"] and offset + 8 <= len(data):
+        block_size, signature = struct.unpack_from("<II", data, offset)
+        if block_size < 8:
+            break
+        if signature == LNK_ENVIRONMENT_BLOCK and block_size >= 8 + 260 + 520:
+            target = read_c_string(data, offset + 8 + 260, unicode=True)
+            metadata["target"] = os.path.expandvars(target or read_c_string(data, offset + 8))
+        offset += block_size
+
+    return metadata
+
+def read_shortcut_metadata(path):
+    if path.lower().endswith('.desktop'):
+        entry = parse_desktop_entry(path)
+        return desktop_entry_metadata(entry) if entry else {}
+    with open(path, 'rb') as f:
+        return parse_lnk(f.read())
+
+class ShortcutMetadataResolver:
+    """Reads shortcut descriptions and targets on a background pool, cached by path and mtime"""
+
+    def __init__(self, cache_file="simplexity_lnk_cache.json", max_workers=4):
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.cache = self.load_cache()
+
+    def load_cache(self):
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r') as f:
+                    return {path: tuple(entry) for path, entry in json.load(f).items()}
+        except:
+            pass
+        return {}
+
+    def save_cache(self):
+        try:
+            with self.lock:
+                snapshot = dict(self.cache)
+            with open(self.cache_file, 'w') as f:
+                json.dump(snapshot, f)
+        except Exception as e:
+            print(f"Error saving shortcut cache: {e}")
+
+    def cached(self, path):
+        entry = self.cache.get(path)
+        return entry[1] if entry else None
+
+    def resolve(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        entry = self.cache.get(path)
+        if entry and entry[0] == mtime:
+            return entry[1]
+        try:
+            metadata = read_shortcut_metadata(path)
+        except (OSError, ValueError, struct.error):
+            metadata = {}
+        self.store(path, mtime, metadata)
+        return metadata
+
+    def store(self, path, mtime, metadata):
+        with self.lock:
+            self.cache[path] = (mtime, metadata)
+
+    def prune(self, live_paths):
+        """Forget shortcuts that are neither in the catalog nor on disk any more"""
+        live_paths = set(live_paths)
+        with self.lock:
+            stale = [path for path in self.cache if path not in live_paths and not os.path.exists(path)]
+            for path in stale:
+                del self.cache[path]
+        return len(stale)
+
+    def resolve_all(self, paths, on_ready):
+        paths = [path for path in paths if path.lower().endswith(('.lnk', '.desktop'))]
+
+        def run():
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix="lnk") as pool:
+                results = dict(zip(paths, pool.map(self.resolve, paths)))
+            self.prune(paths)
+            self.save_cache()
+            on_ready({path: meta for path, meta in results.items() if meta}, elapsed_ms(started))
+
+        threading.Thread(target=run, daemon=True).start()
+
+class UsageHistory:
+    """Launch counts and last-launch times per app path, persisted next to the settings"""
+
+    def __init__(self, history_file="simplexity_history.json"):
+        self.history_file = history_file
+        self.entries = self.load_history()
+        self.generation = 0
+
+    def load_history(self):
+        try:
+            if os.path.exists(self.history_file):
+                with open(self.history_file, 'r') as f:
+                    return json.load(f)
+        except:
+            pass
+        return {}
+
+    def save_history(self):
+        try:
+            with open(self.history_file, 'w') as f:
+                json.dump(self.entries, f)
+        except Exception as e:
+            print(f"Error saving history: {e}")
+
+    def get(self, path):
+        return self.entries.get(path, (0, 0.0))
+
+    def record(self, path):
+        count, last = self.get(path)
+        self.entries[path] = [count + 1, time.time()]
+        self.save_history()
+
+    def clear(self):
+        self.entries = {}
+        self.generation += 1
+        self.save_history()
+
+RECENCY_HALF_LIFE = 7 * 24 * 3600
+
+class RankingStage:
+    """Weighted multi-signal ranking over per-entry feature arrays aligned with the catalog"""
+
+    weights = {"match": 1.0, "recency": 0.25, "frequency": 0.15, "source": 0.05, "length": 0.1}
+
+    def __init__(self, use_numpy=True):
+        self.use_numpy = use_numpy and np is not None
+        self.features = {"recency": [], "frequency": [], "source": [], "length": []}
+        self.rows = {}
+        self.top_frequency = 0.0
+        self.recency_weight = self.weights["recency"]
+        self.static = []
+
+    @staticmethod
+    def recency(last, now):
+        return 0.5 ** ((now - last) / RECENCY_HALF_LIFE) if last else 0.0
+
+    @staticmethod
+    def length(name):
+        return 1.0 / (1.0 + len(name) / 20)
+
+    def rebuild(self, index, history, prioritize_recent=True):
+        now = time.time()
+        user_dirs = tuple(os.path.normcase(d) for d in (start_menu_dirs()[0], xdg_application_dirs()[0]))
+        usage = [history.get(path) for path in index.paths]
+        self.rows = {path: i for i, path in enumerate(index.paths)}
+        self.features = {
+            "recency": [self.recency(last, now) for count, last in usage],
+            "frequency": [math.log1p(count) for count, last in usage],
+            "source": [1.0 if os.path.normcase(path).startswith(user_dirs) else 0.5 for path in index.paths],
+            "length": [self.length(name) for name in index.names],
+        }
+        self.recency_weight = self.weights["recency"] if prioritize_recent else 0.0
+        self.combine()
+
+    def combine(self):
+        """Weighted sum of the feature arrays into the static score of every entry"""
+        w = self.weights
+        f = self.features
+        self.top_frequency = max(f["frequency"], default=0.0)
+        if not self.use_numpy:
+            self.set_static(self.entry_score(i) for i in range(len(f["length"])))
+            return
+        static = self.recency_weight * np.asarray(f["recency"], dtype=np.float64)
+        static += w["frequency"] / (self.top_frequency or 1.0) * np.asarray(f["frequency"], dtype=np.float64)
+        static += w["source"] * np.asarray(f["source"], dtype=np.float64)
+        static += w["length"] * np.asarray(f["length"], dtype=np.float64)
+        self.static = static
+
+    def entry_score(self, i):
+        w = self.weights
+        f = self.features
+        return (self.recency_weight * f["recency"][i] + w["frequency"] * f["frequency"][i] / (self.top_frequency or 1.0)
+                + w["source"] * f["source"][i] + w["length"] * f["length"][i])
+
+    def record(self, path, count, last):
+        """Rescore the launched entry alone, unless it became the most launched and the scale moved"""
+        i = self.rows.get(path)
+        if i is None:
+            return
+        self.features["recency"][i] = self.recency(last, time.time())
+        self.features["frequency"][i] = math.log1p(count)
+        if self.features["frequency"][i] > self.top_frequency:
+            self.combine()
+        else:
+            self.static[i] = self.entry_score(i)
+
+    def score_command(self, match, title):
+        """Builtin commands scored like an app with no launch history"""
+        w = self.weights
+        return w["match"] * match + w["source"] * 1.0 + w["length"] * self.length(title)
+
+    def set_static(self, values):
+        self.static = np.asarray(values, dtype=np.float64) if self.use_numpy else list(values)
+
+    def rank(self, candidates, limit):
+        """Top `limit` (app_id, score) pairs from a {app_id: match_score} mapping, best first, ties by app_id"""
+        if not candidates:
+            return []
+        match_weight = self.weights["match"]
+        if not self.use_numpy:
+            static = self.static
+            return heapq.nlargest(
+                limit,
+                ((app_id, match_weight * match + static[app_id]) for app_id, match in candidates.items()),
+                key=lambda ranked: (ranked[1], -ranked[0])
+            )
+
+        count = len(candidates)
+        ids = np.fromiter(candidates.keys(), dtype=np.intp, count=count)
+        scores = match_weight * np.fromiter(candidates.values(), dtype=np.float64, count=count)
+        scores += self.static[ids]
+        if count > limit:
+            threshold = np.partition(scores, count - limit)[count - limit]
+            top = np.flatnonzero(scores >= threshold)
+        else:
+            top = np.arange(count)
+        top = top[np.lexsort((ids[top], -scores[top]))][:limit]
+        return list(zip(ids[top].tolist(), scores[top].tolist()))
+
+class CatalogWatcher(QObject):
+    """Emits changed once shortcuts are added, removed or renamed and the directories settle"""
+
+    changed = pyqtSignal()
+
+    def __init__(self, dirs, parent=None, settle_ms=2000):
+        super().__init__(parent)
+        self.dirs = dirs
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(settle_ms)
+        self.settle_timer.timeout.connect(self.changed.emit)
+
+    def scan(self):
+        return {root for start_dir in self.dirs for root, dirs, files in os.walk(start_dir)}
+
+    def rewatch(self):
+        """Follow subdirectories created or removed since the last catalog load"""
+        watched = set(self.watcher.directories())
+        wanted = self.scan()
+        if watched - wanted:
+            self.watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self.watcher.addPaths(list(wanted - watched))
+
+    def on_directory_changed(self, path):
+        self.settle_timer.start()
+
+class QueryCache:
+    """LRU cache of ranked result rows, bounded by entry count and approximate size"""
+
+    def __init__(self, max_entries=256, max_bytes=512 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.generation = None
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, query, generation):
+        if generation != self.generation:
+            if self.entries:
+                self.invalidations += 1
+            self.clear()
+            self.generation = generation
+        key = (query, generation)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, query, generation, rows):
+        if generation != self.generation:
+            return
+        key = (query, generation)
+        size = sys.getsizeof(query) + sum(
+            sys.getsizeof(label) + sys.getsizeof(data) for label, data in rows
+        )
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self.entries[key] = (rows, size)
+        self.size += size
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def discard(self, predicate):
+        """Drop only the cached queries whose rows a change can affect, keeping the rest warm"""
+        for key in [key for key, (rows, size) in self.entries.items() if predicate(rows)]:
+            self.size -= self.entries.pop(key)[1]
+            self.invalidations += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups * 100 if lookups else 0.0
+        return (f"{len(self.entries)} entries, {self.size} bytes, "
+                f"{self.hits}/{lookups} hits ({hit_rate:.1f}%), "
+                f"{self.evictions} evictions, {self.invalidations} invalidations")
+
+class LatencyRecorder:
+    """Thread-safe rolling latency samples grouped by category and key"""
+
+    def __init__(self, max_samples=64):
+        self.max_samples = max_samples
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, category, key, elapsed_ms):
+        with self.lock:
+            per_key = self.samples.setdefault(category, {})
+            if key not in per_key:
+                per_key[key] = deque(maxlen=self.max_samples)
+            per_key[key].append(elapsed_ms)
+
+    def clear(self, category=None):
+        with self.lock:
+            if category is None:
+                self.samples.clear()
+            else:
+                self.samples.pop(category, None)
+
+    def summary(self, category):
+        with self.lock:
+            per_key = {key: list(values) for key, values in self.samples.get(category, {}).items()}
+        return {
+            key: (len(values), sum(values) / len(values), max(values))
+            for key, values in per_key.items() if values
+        }
+
+    def report(self, category):
+        lines = [f"{category}:"]
+        for key, (count, avg, worst) in sorted(self.summary(category).items()):
+            lines.append(f"  {key}: n={count} avg={avg:.1f}ms max={worst:.1f}ms")
+        return "\n".join(lines)
+
+class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+    _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + [
+        (name, ctypes.c_size_t) for name in (
+            "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+            "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+        )
+    ]
+
+def resident_memory():
+    """Current resident set size in bytes, or None where it can't be read"""
+    if sys.platform == "win32":
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32 = ctypes.windll.kernel32
+        psapi = ctypes.windll.psapi
+        kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+        psapi.GetProcessMemoryInfo.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), ctypes.c_ulong
+        ]
+        if psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
     try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
 
-        result = eval(expr, {"__builtins__": {}, "math": math, "abs": abs})
-        return result
-    except:
+def release_free_heap():
+    """Collect cycles and hand freed heap pages back to the OS where the allocator allows it"""
+    gc.collect()
+    if sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+MEMORY_SUBSYSTEMS = {
+    "catalog": [
+        "start_menu_dirs", "iter_start_menu_apps", "parse_desktop_entry", "desktop_entry_metadata",
+        "iter_desktop_apps", "CatalogCanonicalizer", "CatalogWatcher", "parse_lnk",
+        "read_shortcut_metadata", "ShortcutMetadataResolver", "SimplexityLauncher.reload_catalog",
+        "SimplexityLauncher.canonicalize_catalog", "SimplexityLauncher.apply_catalog",
+        "SimplexityLauncher.on_metadata_resolved",
+    ],
+    "index": [
+        "fold_text", "TokenTrie", "TypoIndex", "SearchView", "SearchIndex", "UsageHistory",
+        "RankingStage", "QueryCache", "SimplexityLauncher.select_search_view",
+        "SimplexityLauncher.rebuild_ranking",
+    ],
+    "results UI": [
+        "ModernListWidget", "ResultPageModel", "ResultItemDelegate.paint", "SuggestionProvider",
+        "SimplexityLauncher.on_text_changed", "SimplexityLauncher.compute_results",
+        "SimplexityLauncher.match_apps", "SimplexityLauncher.populate_expanded",
+        "SimplexityLauncher.show_suggestions",
+    ],
+    "settings dialog": ["SettingsDialog", "SettingsManager", "SimplexityLauncher.show_settings"],
+    "icons": ["ResultItemDelegate.background", "SimplexityLauncher.create_tray_icon"],
+}
+
+def code_lines(code):
+    """Line numbers of a code object and the functions nested in it"""
+    lines = [line for offset, line in dis.findlinestarts(code) if line is not None]
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            lines.extend(code_lines(const))
+    return lines
+
+def source_range(target):
+    """First and last line of a function or class, from the code objects when there is no source"""
+    try:
+        lines, first = inspect.getsourcelines(target)
+        return first, first + len(lines) - 1
+    except (OSError, TypeError):
+        pass
+    if inspect.isclass(target):
+        functions = [getattr(value, "__func__", value) for value in vars(target).values()]
+    else:
+        functions = [getattr(target, "__func__", target)]
+    lines = [
+        line for function in functions if hasattr(function, "__code__")
+        for line in code_lines(function.__code__)
+    ]
+    if not lines:
+        return None
+    return min(lines), max(lines)
+
+class MemoryDiagnostics:
+    """tracemalloc snapshots tagged by subsystem, plus live Qt object and thread counts
+
+    Nothing is traced until start(); snapshots attribute each allocation to the innermost
+    frame of this file that falls inside one of the MEMORY_SUBSYSTEMS line ranges.
+    """
+
+    def __init__(self, subsystems=None, frames=16, dump_file="simplexity_memory.json"):
+        self.frames = frames
+        self.dump_file = dump_file
+        self.filename = self.tag_line.__code__.co_filename
+        self.ranges = []
+        for subsystem, names in (subsystems or MEMORY_SUBSYSTEMS).items():
+            for name in names:
+                target = globals().get(name.split(".")[0])
+                for attribute in name.split(".")[1:]:
+                    target = getattr(target, attribute, None)
+                if target is None:
+                    continue
+                lines = source_range(target)
+                if lines is None:
+                    continue
+                self.ranges.append((lines[0], lines[1], subsystem))
+        self.ranges.sort()
+        self.starts = [first for first, last, subsystem in self.ranges]
+        self.tags = {}
+        self.snapshots = []
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.tags.clear()
+
+    def tag_line(self, lineno):
+        """Innermost subsystem range containing the line; methods win over their class"""
+        i = bisect.bisect_right(self.starts, lineno)
+        while i > 0:
+            i -= 1
+            first, last, subsystem = self.ranges[i]
+            if first <= lineno <= last:
+                return subsystem
         return None
 
-def is_math_expression(text):
-    """Check if text looks like a mathematical expression"""
+    def tag(self, traceback):
+        for frame in reversed(traceback):
+            if frame.filename != self.filename:
+                continue
+            key = frame.lineno
+            if key not in self.tags:
+                self.tags[key] = self.tag_line(key)
+            if self.tags[key] is not None:
+                return self.tags[key]
+        return "other"
+
+    def qt_counts(self, root=None):
+        counts = Counter(type(widget).__name__ for widget in QApplication.allWidgets())
+        if root is not None:
+            counts.update(
+                f"{type(child).__name__} (non-widget)" for child in root.findChildren(QObject)
+                if not isinstance(child, QWidget)
+            )
+            counts["QListWidgetItem"] = sum(view.count() for view in root.findChildren(QListWidget))
+        return dict(counts)
+
+    def snapshot(self, label, root=None):
+        traced = {}
+        if tracemalloc.is_tracing():
+            for stat in tracemalloc.take_snapshot().statistics("traceback"):
+                subsystem = self.tag(stat.traceback)
+                size, count = traced.get(subsystem, (0, 0))
+                traced[subsystem] = (size + stat.size, count + stat.count)
+        record = {
+            "label": label,
+            "time": time.time(),
+            "rss": resident_memory(),
+            "traced": {subsystem: {"bytes": size, "blocks": count} for subsystem, (size, count) in traced.items()},
+            "qt": self.qt_counts(root),
+            "threads": dict(Counter(thread.name.split("-")[0] for thread in threading.enumerate())),
+        }
+        self.snapshots.append(record)
+        return record
+
+    def report(self, first=None, last=None):
+        if len(self.snapshots) < 2:
+            return "memory: take at least two snapshots to compare"
+        first = first if first is not None else self.snapshots[-2]
+        last = last if last is not None else self.snapshots[-1]
+        lines = [f"memory growth {first['label']} -> {last['label']} "
+                 f"({last['time'] - first['time']:.0f}s):"]
+        if first["rss"] is not None and last["rss"] is not None:
+            lines.append(f"  rss: {last['rss'] / 1048576:.1f}MB ({(last['rss'] - first['rss']) / 1024:+.0f}KB)")
+        subsystems = sorted(set(first["traced"]) | set(last["traced"]))
+        for subsystem in subsystems:
+            before = first["traced"].get(subsystem, {"bytes": 0, "blocks": 0})
+            after = last["traced"].get(subsystem, {"bytes": 0, "blocks": 0})
+            lines.append(f"  {subsystem}: {after['bytes'] / 1024:.0f}KB "
+                         f"({(after['bytes'] - before['bytes']) / 1024:+.0f}KB, "
+                         f"{after['blocks'] - before['blocks']:+d} blocks)")
+        for label, key in (("qt", "qt"), ("threads", "threads")):
+            grown = [
+                f"{name} {last[key].get(name, 0)} ({last[key].get(name, 0) - first[key].get(name, 0):+d})"
+                for name in sorted(set(first[key]) | set(last[key]))
+                if last[key].get(name, 0) != first[key].get(name, 0)
+            ]
+            lines.append(f"  {label}: {', '.join(grown) if grown else 'no change'}")
+        return "\n".join(lines)
+
+    def dump(self):
+        try:
+            with open(self.dump_file, "w") as f:
+                json.dump(self.snapshots, f, indent=2)
+        except Exception as e:
+            print(f"Error dumping memory snapshots: {e}")
+
+class WindowsLaunchBackend:
+    def open_path(self, path):
+        os.startfile(path)
+
+    def open_url(self, url):
+        webbrowser.open(url)
 
-    math_pattern = r'[0-9+\-*/().^]'
-    math_functions = ['sin', 'cos', 'tan', 'sqrt', 'log', 'ln', 'pi', 'e']
+class PosixLaunchBackend:
+    def __init__(self, opener=None):
+        self.opener = opener or ("open" if sys.platform == "darwin" else "xdg-open")
 
-    has_math_chars = bool(re.search(math_pattern, text))
-    has_math_functions = any(func in text.lower() for func in math_functions)
+    def run(self, *args):
+        subprocess.Popen(
+            [self.opener, *args],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
 
-    return has_math_chars or has_math_functions
+    def open_path(self, path):
+        if path.endswith('.desktop'):
+            self.launch_desktop_entry(path)
+        else:
+            self.run(path)
+
+    def launch_desktop_entry(self, path):
+        argv = desktop_exec_argv(parse_desktop_entry(path).get("Exec", ""))
+        if not argv:
+            raise OSError(f"{path} has no Exec line")
+        subprocess.Popen(
+            argv,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+
+    def open_url(self, url):
+        self.run(url)
+
+def default_launch_backend():
+    if hasattr(os, "startfile"):
+        return WindowsLaunchBackend()
+    return PosixLaunchBackend()
+
+class LaunchExecutor:
+    """Runs launches on worker threads so the GUI thread never waits on the OS shell"""
+
+    def __init__(self, backend=None, metrics=None, on_error=None, on_launched=None,
+                 timeout=10.0, max_workers=2):
+        self.backend = backend or default_launch_backend()
+        self.metrics = metrics or LatencyRecorder()
+        self.on_error = on_error
+        self.on_launched = on_launched
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="launch")
+
+    def open_path(self, path):
+        return self.submit(self.backend.open_path, path)
+
+    def open_url(self, url):
+        return self.submit(self.backend.open_url, url)
+
+    def submit(self, action, target):
+        started = time.perf_counter()
+        future = self.pool.submit(self.run, action, target, started)
+        watchdog = threading.Timer(self.timeout, self.check_timeout, (future, target))
+        watchdog.daemon = True
+        watchdog.start()
+        future.add_done_callback(lambda f: watchdog.cancel())
+        return future
+
+    def run(self, action, target, started):
+        try:
+            action(target)
+        except Exception as e:
+            self.report_error(target, f"Couldn't open {target}: {e}")
+            return False
+        launch_ms = elapsed_ms(started)
+        self.metrics.record("launch", target, launch_ms)
+        if self.on_launched:
+            self.on_launched(target, launch_ms)
+        return True
+
+    def check_timeout(self, future, target):
+        if not future.done():
+            self.report_error(target, f"Opening {target} is taking longer than {self.timeout:g}s")
+
+    def report_error(self, target, message):
+        if self.on_error:
+            self.on_error(target, message)
+        else:
+            print(message)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+
+SEARCH_ENGINES = {
+    "perplexity": ("pp", "Perplexity AI", "https://www.perplexity.ai/search/new?q={query}"),
+    "google": ("g", "Google", "https://www.google.com/search?q={query}"),
+    "bing": ("b", "Bing", "https://www.bing.com/search?q={query}"),
+    "duckduckgo": ("ddg", "DuckDuckGo", "https://duckduckgo.com/?q={query}"),
+    "yahoo": ("y", "Yahoo", "https://search.yahoo.com/search?p={query}"),
+}
+
+class SearchEngineRouter:
+    """Keyword table for '!g foo' style queries, built from the engine settings"""
+
+    trigger = "!"
+
+    def __init__(self, default="perplexity", custom=None):
+        self.engines = {name: (title, url) for name, (keyword, title, url) in SEARCH_ENGINES.items()}
+        self.keywords = {keyword: name for name, (keyword, title, url) in SEARCH_ENGINES.items()}
+        for keyword, url in (custom or {}).items():
+            if isinstance(url, str) and "{query}" in url:
+                self.engines[keyword] = (keyword, url)
+                self.keywords[keyword.lower()] = keyword
+            else:
+                print(f"Ignoring custom search engine {keyword!r}: url needs a {{query}} placeholder")
+        self.default = default if default in self.engines else "perplexity"
+
+    def route(self, text):
+        """(engine, query) when text starts with the trigger and an engine keyword, otherwise None"""
+        if not text.startswith(self.trigger):
+            return None
+        keyword, _, query = text[len(self.trigger):].partition(" ")
+        engine = self.keywords.get(keyword.lower())
+        query = query.strip()
+        if engine is None or not query:
+            return None
+        return engine, query
+
+    def title(self, engine):
+        return self.engines[engine][0]
+
+    def url(self, engine, query):
+        title, url = self.engines.get(engine, self.engines[self.default])
+        return url.replace("{query}", urllib.parse.quote_plus(query))
+
+def parse_suggestions(body):
+    """Suggestions from an OpenSearch ['query', [...]] or a [{'phrase': ...}] response"""
+    data = json.loads(body)
+    if isinstance(data, list) and len(data) > 1 and isinstance(data[1], list):
+        return [item for item in data[1] if isinstance(item, str)]
+    if isinstance(data, list):
+        return [item["phrase"] for item in data if isinstance(item, dict) and "phrase" in item]
+    return []
+
+class SuggestionProvider:
+    """Debounced, TTL-cached suggestion fetches on one worker thread over keep-alive connections"""
+
+    def __init__(self, url, on_ready, debounce=0.15, ttl=300.0, timeout=2.0,
+                 max_entries=256, clock=time.monotonic):
+        self.url = url
+        self.on_ready = on_ready
+        self.debounce = debounce
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.clock = clock
+        self.cache = OrderedDict()
+        self.connections = {}
+        self.condition = threading.Condition()
+        self.pending = None
+        self.pending_at = 0.0
+        self.stopped = False
+        self.thread = None
+        self.requests = 0
+        self.hits = 0
+        self.errors = 0
+
+    def cached(self, query):
+        with self.condition:
+            entry = self.cache.get(query)
+            if entry is None or entry[0] < self.clock():
+                return None
+            self.cache.move_to_end(query)
+            return entry[1]
+
+    def request(self, query):
+        """Cached suggestions right away, otherwise None and a debounced fetch"""
+        suggestions = self.cached(query)
+        if suggestions is not None:
+            self.hits += 1
+            self.cancel()
+            return suggestions
+        with self.condition:
+            self.pending = query
+            self.pending_at = self.clock()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="suggestions", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return None
+
+    def cancel(self):
+        with self.condition:
+            self.pending = None
+
+    def clear(self):
+        with self.condition:
+            self.cache.clear()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    break
+                delay = self.pending_at + self.debounce - self.clock()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                query = self.pending
+                self.pending = None
+            suggestions = self.fetch(query)
+            if suggestions is None:
+                continue
+            with self.condition:
+                self.cache[query] = (self.clock() + self.ttl, suggestions)
+                while len(self.cache) > self.max_entries:
+                    self.cache.popitem(last=False)
+            self.on_ready(query, suggestions)
+        for connection in self.connections.values():
+            connection.close()
+        self.connections.clear()
+
+    def connection(self, scheme, host):
+        connection = self.connections.get((scheme, host))
+        if connection is None:
+            factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connection = self.connections[(scheme, host)] = factory(host, timeout=self.timeout)
+        return connection
+
+    def fetch(self, query):
+        parts = urllib.parse.urlsplit(self.url.replace("{query}", urllib.parse.quote_plus(query)))
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        self.requests += 1
+        for attempt in range(2):
+            connection = self.connection(parts.scheme, parts.netloc)
+            try:
+                connection.request("GET", target, headers={"User-Agent": "Simplexity"})
+                response = connection.getresponse()
+                body = response.read()
+                if response.status != 200:
+                    raise OSError(f"HTTP {response.status}")
+                return parse_suggestions(body)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                self.connections.pop((parts.scheme, parts.netloc), None)
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                connection.close()
+                self.connections.pop((parts.scheme, parts.netloc), None)
+                self.errors += 1
+                print(f"Suggestions for {query!r} failed: {e}")
+                return None
+        self.errors += 1
+        return None
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+    def stats(self):
+        return (f"{len(self.cache)} cached, {self.requests} fetched, {self.hits} cache hits, "
+                f"{self.errors} errors, {len(self.connections)} open connections")
+
+class LaunchPrewarmer:
+    """Speculatively resolves a shortcut's target and pulls the executable into the page cache
+
+    One job runs at a time on a worker thread; cancel() stops it between reads.
+    """
+
+    def __init__(self, resolver, metrics=None, read_limit=16 * 1024 * 1024,
+                 chunk_size=1024 * 1024, rewarm_after=120.0):
+        self.resolver = resolver
+        self.metrics = metrics or LatencyRecorder()
+        self.read_limit = read_limit
+        self.chunk_size = chunk_size
+        self.rewarm_after = rewarm_after
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prewarm")
+        self.cancelled = None
+        self.warmed = {}
+        self.targets = {}
+        self.launches = {}
+        self.lock = threading.Lock()
+        self.jobs = 0
+        self.hits = 0
+        self.misses = 0
+
+    def schedule(self, path):
+        self.cancel()
+        with self.lock:
+            if path in self.warmed:
+                return None
+        cancelled = self.cancelled = threading.Event()
+        self.jobs += 1
+        return self.pool.submit(self.warm, path, cancelled)
+
+    def cancel(self):
+        if self.cancelled is not None:
+            self.cancelled.set()
+            self.cancelled = None
+
+    def resolve_target(self, path):
+        if not path.lower().endswith(('.lnk', '.desktop')):
+            return path
+        target = (self.resolver.resolve(path) or {}).get("target", "")
+        if target and not os.path.isabs(target):
+            target = shutil.which(target) or ""
+        return target
+
+    def warm(self, path, cancelled):
+        if cancelled.is_set():
+            return False
+        started = time.perf_counter()
+        target = self.resolve_target(path)
+        if not target or cancelled.is_set():
+            return False
+        with self.lock:
+            last = self.targets.get(target)
+        if last is None or time.monotonic() - last > self.rewarm_after:
+            if not self.warm_file(target, cancelled):
+                return False
+        warm_ms = elapsed_ms(started)
+        with self.lock:
+            self.targets[target] = time.monotonic()
+            self.warmed[path] = warm_ms
+            while len(self.warmed) > 256:
+                del self.warmed[next(iter(self.warmed))]
+        self.metrics.record("prewarm", "warm", warm_ms)
+        return True
+
+    def warm_file(self, target, cancelled):
+        """Readahead via posix_fadvise where available, otherwise a bounded chunked read"""
+        try:
+            with open(target, 'rb', buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, self.read_limit, os.POSIX_FADV_WILLNEED)
+                    return True
+                remaining = self.read_limit
+                while remaining > 0 and not cancelled.is_set():
+                    chunk = f.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                return not cancelled.is_set()
+        except OSError:
+            return False
+
+    def launched(self, path):
+        """Count a launch as a hit when its shortcut was warmed before Enter"""
+        with self.lock:
+            warm_ms = self.warmed.pop(path, None)
+            self.launches[path] = warm_ms is not None
+        if warm_ms is None:
+            self.misses += 1
+            return False
+        self.hits += 1
+        self.metrics.record("prewarm", "warm time (launched)", warm_ms)
+        return True
+
+    def record_launch(self, path, launch_ms):
+        with self.lock:
+            warmed = self.launches.pop(path, None)
+        if warmed is not None:
+            self.metrics.record("prewarm", "launch warm" if warmed else "launch cold", launch_ms)
+
+    def invalidate(self):
+        with self.lock:
+            self.warmed.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.shutdown(wait=False)
+
+    def stats(self):
+        launches = self.hits + self.misses
+        hit_rate = self.hits / launches * 100 if launches else 0.0
+        summary = self.metrics.summary("prewarm")
+        if "launch warm" in summary and "launch cold" in summary:
+            gain = f", launch avg {summary['launch warm'][1]:.1f}ms warm vs {summary['launch cold'][1]:.1f}ms cold"
+        else:
+            gain = ""
+        return (f"prewarm: {self.jobs} jobs, {self.hits}/{launches} launches warmed "
+                f"({hit_rate:.1f}%), {len(self.warmed)} warmed but not launched{gain}")
+
+class PrefixTrie:
+    """Maps every prefix of the inserted words to the values stored under them"""
+
+    def __init__(self):
+        self.root = ({}, [])
+
+    def insert(self, word, value):
+        node = self.root
+        for char in word:
+            children, values = node
+            node = children.get(char)
+            if node is None:
+                node = children[char] = ({}, [])
+            if value not in node[1]:
+                node[1].append(value)
+
+    def lookup(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node[0].get(char)
+            if node is None:
+                return []
+        return node[1]
+
+class Command:
+    def __init__(self, command_id, title, aliases, handler, exact=False):
+        self.command_id = command_id
+        self.title = title
+        self.aliases = aliases
+        self.handler = handler
+        self.exact = exact
+
+class CommandRegistry:
+    """Builtin commands looked up by alias prefix, plus dispatch for every result row"""
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.commands = {}
+        self.trie = PrefixTrie()
+        self.actions = {"cmd": self.run_command}
+
+    def register(self, command_id, title, aliases, handler, exact=False):
+        """exact commands only match a whole alias, for the ones Enter shouldn't fire by accident"""
+        command = Command(command_id, title, tuple(alias.lower() for alias in aliases), handler, exact)
+        self.commands[command_id] = command
+        for alias in command.aliases:
+            self.trie.insert(alias, command_id)
+
+    def register_action(self, kind, handler):
+        self.actions[kind] = handler
+
+    def is_action(self, data):
+        return data.partition(":")[0] in self.actions
+
+    def lookup(self, query):
+        query = query.lower()
+        matched = []
+        for command_id in self.trie.lookup(query):
+            command = self.commands[command_id]
+            if query in command.aliases:
+                matched.append((1.0, command))
+            elif not command.exact:
+                matched.append((0.8, command))
+        return matched
+
+    def run_command(self, command_id, text):
+        command = self.commands.get(command_id)
+        if command is not None:
+            command.handler(text)
+
+    def dispatch(self, data, text):
+        if not data:
+            return
+        kind, _, arg = data.partition(":")
+        handler = self.actions.get(kind)
+        if handler is None:
+            self.fallback(data)
+        else:
+            handler(arg, text)
+
+HOTKEY_MODIFIERS = {"ctrl": "ctrl", "control": "ctrl", "alt": "alt", "shift": "shift",
+                    "win": "cmd", "cmd": "cmd", "super": "cmd"}
+HOTKEY_KEY_ALIASES = {"escape": "esc", "return": "enter"}
+
+def parse_hotkey(combination):
+    """'Ctrl+Shift+Space' -> (frozenset({'ctrl', 'shift'}), 'space')"""
+    parts = [part.strip().lower() for part in combination.split('+') if part.strip()]
+    if not parts:
+        raise ValueError(f"empty hotkey {combination!r}")
+    modifiers = set()
+    for part in parts[:-1]:
+        if part not in HOTKEY_MODIFIERS:
+            raise ValueError(f"unknown modifier {part!r} in {combination!r}")
+        modifiers.add(HOTKEY_MODIFIERS[part])
+    key = HOTKEY_KEY_ALIASES.get(parts[-1], parts[-1])
+    return frozenset(modifiers), key
+
+def hotkey_spec(settings_manager):
+    combination = settings_manager.get("hotkey_combination")
+    if combination == "Custom":
+        combination = f"{settings_manager.get('hotkey_modifier')}+{settings_manager.get('hotkey_key')}"
+    double_tap = "ctrl" if settings_manager.get("enable_double_ctrl") else None
+    return combination, double_tap
+
+class HotkeyStateMachine:
+    """Matches one key combination, and optionally a double-tapped modifier, over key tokens"""
+
+    IDLE, MODIFIER_DOWN, TAPPED = range(3)
+
+    def __init__(self, modifiers, key, on_trigger, double_tap=None, tap_interval=0.4,
+                 clock=time.monotonic, on_arm=None, on_disarm=None):
+        self.modifiers = modifiers
+        self.key = key
+        self.on_trigger = on_trigger
+        self.on_arm = on_arm
+        self.on_disarm = on_disarm
+        self.armed = False
+        self.double_tap = double_tap
+        self.tap_interval = tap_interval
+        self.clock = clock
+        self.held = set()
+        self.tap_state = self.IDLE
+        self.tap_time = 0.0
+
+    def watched_tokens(self):
+        tokens = set(self.modifiers) | {self.key}
+        if self.double_tap:
+            tokens.add(self.double_tap)
+        return tokens
+
+    def trigger(self):
+        self.tap_state = self.IDLE
+        self.on_trigger()
+
+    def arm(self):
+        """The hotkey's modifiers are down with nothing else pressed yet"""
+        if not self.armed and self.on_arm is not None:
+            self.armed = True
+            self.on_arm()
+
+    def disarm(self):
+        if self.armed:
+            self.armed = False
+            if self.on_disarm is not None:
+                self.on_disarm()
+
+    def press(self, token):
+        if token in self.held:
+            return
+        self.held.add(token)
+        if token == self.double_tap or (token in self.modifiers and self.held >= self.modifiers):
+            self.arm()
+        else:
+            self.disarm()
+        if token == self.key:
+            if self.held >= self.modifiers:
+                self.trigger()
+            else:
+                self.tap_state = self.IDLE
+        elif token == self.double_tap:
+            now = self.clock()
+            if self.tap_state == self.TAPPED and now - self.tap_time <= self.tap_interval:
+                self.trigger()
+            else:
+                self.tap_state = self.MODIFIER_DOWN
+                self.tap_time = now
+
+    def release(self, token):
+        self.held.discard(token)
+        if token in self.modifiers or token == self.double_tap:
+            self.disarm()
+        if token == self.double_tap and self.tap_state == self.MODIFIER_DOWN:
+            now = self.clock()
+            if now - self.tap_time <= self.tap_interval:
+                self.tap_state = self.TAPPED
+                self.tap_time = now
+            else:
+                self.tap_state = self.IDLE
+
+    def interrupt(self):
+        self.tap_state = self.IDLE
+        self.disarm()
+
+def pynput_key_tokens():
+    Key = keyboard.Key
+    names = {
+        "ctrl": ("ctrl", "ctrl_l", "ctrl_r"),
+        "alt": ("alt", "alt_l", "alt_r", "alt_gr"),
+        "shift": ("shift", "shift_l", "shift_r"),
+        "cmd": ("cmd", "cmd_l", "cmd_r"),
+        "space": ("space",), "enter": ("enter",), "tab": ("tab",), "esc": ("esc",),
+    }
+    names.update({f"f{n}": (f"f{n}",) for n in range(1, 13)})
+    tokens = {}
+    for token, members in names.items():
+        for member in members:
+            key = getattr(Key, member, None)
+            if key is not None:
+                tokens[key] = token
+    return tokens
+
+class PynputHotkeyBackend:
+    """Feeds a HotkeyStateMachine from a pynput listener, dropping unwatched keys with one dict lookup
+
+    Special keys are looked up by id(): Key members are singletons, and hashing the key itself would
+    go through the Python-level Enum/KeyCode __hash__ on every event. The left and right variants of
+    a modifier share a token, so the token is released only once all of its physical keys are up.
+    """
+
+    def __init__(self, machine):
+        self.machine = machine
+        watched = machine.watched_tokens()
+        self.special = {id(key): token for key, token in pynput_key_tokens().items() if token in watched}
+        self.chars = {token: token for token in watched if len(token) == 1}
+        self.vks = {ord(token.upper()): token for token in self.chars}
+        self.down = {}
+        self.listener = None
+
+    def char_token(self, key):
+        token = self.vks.get(getattr(key, 'vk', None))
+        if token is None:
+            char = getattr(key, 'char', None)
+            token = self.chars.get(char.lower()) if char else None
+        return token
+
+    def on_press(self, key):
+        physical = id(key)
+        token = self.special.get(physical)
+        if token is None:
+            token = self.char_token(key) if self.chars else None
+            if token is None:
+                if self.machine.tap_state or self.machine.armed:
+                    self.machine.interrupt()
+                return
+            physical = token
+        keys = self.down.get(token)
+        if keys is None:
+            self.down[token] = {physical}
+            self.machine.press(token)
+        else:
+            keys.add(physical)
+
+    def on_release(self, key):
+        physical = id(key)
+        token = self.special.get(physical)
+        if token is None:
+            token = self.char_token(key) if self.chars else None
+            if token is None:
+                return
+            physical = token
+        keys = self.down.get(token)
+        if keys is not None:
+            keys.discard(physical)
+            if keys:
+                return
+            del self.down[token]
+        self.machine.release(token)
+
+    def start(self):
+        self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+MATH_TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-z]+)|(\*\*|[-+*/^()]))")
+MATH_CONSTANTS = {"pi": math.pi, "e": math.e}
+MATH_FUNCTIONS = {
+    "sin": math.sin, "cos": math.cos, "tan": math.tan, "sqrt": math.sqrt,
+    "log": math.log10, "ln": math.log, "abs": abs,
+}
+
+def tokenize_math(text):
+    """Lex text in one pass; the tokens if they form a valid expression prefix, otherwise None"""
+    tokens = []
+    expect = "operand"
+    depth = 0
+    pos = 0
+    end = len(text.rstrip())
+    match = MATH_TOKEN_RE.match
+    while pos < end:
+        m = match(text, pos)
+        if m is None:
+            return None
+        pos = m.end()
+        number, name, op = m.groups()
+        if number is not None or name is not None:
+            if expect != "operand":
+                return None
+            if number is not None:
+                tokens.append(("num", float(number) if "." in number else int(number)))
+                expect = "operator"
+                continue
+            name = name.lower()
+            if name in MATH_CONSTANTS:
+                tokens.append(("num", MATH_CONSTANTS[name]))
+                expect = "operator"
+            elif name in MATH_FUNCTIONS:
+                tokens.append(("func", MATH_FUNCTIONS[name]))
+                expect = "call"
+            else:
+                return None
+        elif op == "(":
+            if expect == "operator":
+                return None
+            tokens.append(("op", op))
+            depth += 1
+            expect = "operand"
+        elif op == ")":
+            if expect != "operator" or not depth:
+                return None
+            tokens.append(("op", op))
+            depth -= 1
+        elif expect == "call":
+            return None
+        elif expect == "operand":
+            if op not in "+-":
+                return None
+            tokens.append(("unary", op))
+        else:
+            tokens.append(("op", "^" if op == "**" else op))
+            expect = "operand"
+    return tokens or None
+
+# Exact integers past this go through float; str() refuses ints over 4300 digits (~14280 bits)
+MATH_MAX_INT_BITS = 10000
+
+class MathParser:
+    """Recursive-descent evaluator over the tokens from tokenize_math"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        if token[0] is None:
+            raise ValueError("incomplete expression")
+        self.pos += 1
+        return token
+
+    def evaluate(self):
+        value = self.expression()
+        if self.pos != len(self.tokens):
+            raise ValueError("unexpected token")
+        return value
+
+    def expression(self):
+        value = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            if self.take()[1] == "+":
+                value += self.term()
+            else:
+                value -= self.term()
+        return value
+
+    def term(self):
+        value = self.unary()
+        while self.peek() in (("op", "*"), ("op", "/")):
+            if self.take()[1] == "*":
+                value *= self.unary()
+            else:
+                value /= self.unary()
+        return value
+
+    def unary(self):
+        if self.peek()[0] == "unary":
+            sign = self.take()[1]
+            value = self.unary()
+            return -value if sign == "-" else value
+        return self.power()
+
+    def power(self):
+        base = self.atom()
+        if self.peek() != ("op", "^"):
+            return base
+        self.take()
+        exponent = self.unary()
+        if isinstance(base, int) and isinstance(exponent, int) and base.bit_length() * exponent > MATH_MAX_INT_BITS:
+            return float(base) ** exponent
+        return base ** exponent
+
+    def atom(self):
+        kind, value = self.take()
+        if kind == "num":
+            return value
+        if kind == "func":
+            self.take()
+            argument = self.expression()
+            if self.take() != ("op", ")"):
+                raise ValueError("expected )")
+            return value(argument)
+        if (kind, value) == ("op", "("):
+            inner = self.expression()
+            if self.take() != ("op", ")"):
+                raise ValueError("expected )")
+            return inner
+        raise ValueError(f"unexpected {value!r}")
+
+def evaluate_math_tokens(tokens):
+    if not tokens:
+        return None
+    try:
+        result = MathParser(tokens).evaluate()
+        if isinstance(result, int) and result.bit_length() > MATH_MAX_INT_BITS:
+            result = float(result)
+    except (ValueError, ZeroDivisionError, OverflowError, TypeError, RecursionError):
+        return None
+    if isinstance(result, complex):
+        return None
+    return result
+
+def evaluate_math_expression(expr):
+    """Safely evaluate mathematical expressions"""
+    return evaluate_math_tokens(tokenize_math(expr))
+
+def is_math_expression(text):
+    """Check if text looks like a mathematical expression"""
+    return tokenize_math(text) is not None
 
 class AnimatedLineEdit(QLineEdit):
     def __init__(self):
         super().__init__()
         self._glow_radius = 0
+        self.animations_enabled = True
         self.animation = QPropertyAnimation(self, b"glowRadius")
         self.animation.setDuration(300)
         self.animation.setEasingCurve(QEasingCurve.Type.OutCubic)
 
+    def configure_animation(self, enabled, duration):
+        self.animations_enabled = enabled
+        self.animation.setDuration(duration)
+        if not enabled:
+            self.animation.stop()
+            self.glowRadius = 0
+
     @pyqtProperty(int)
     def glowRadius(self):
         return self._glow_radius
@@ -756,113 +2841,429 @@ class AnimatedLineEdit(QLineEdit):
 
     def focusInEvent(self, event):
         super().focusInEvent(event)
+        if not self.animations_enabled:
+            return
         self.animation.setStartValue(0)
         self.animation.setEndValue(15)  
         self.animation.start()
 
     def focusOutEvent(self, event):
         super().focusOutEvent(event)
+        if not self.animations_enabled:
+            return
         self.animation.setStartValue(15)
         self.animation.setEndValue(0)
         self.animation.start()
 
-class ModernListWidget(QListWidget):
+class ResultItemDelegate(QStyledItemDelegate):
+    """Paints result rows from cached fonts and pre-rendered backgrounds, bypassing the stylesheet"""
+
+    min_row_height = 35
+
+    def __init__(self, accent_color, parent=None):
+        super().__init__(parent)
+        self.highlighter = None
+        theme = THEME_COLORS[True]
+        self.set_style(
+            accent_color, theme["text"], theme["secondary_text"],
+            theme["selected_text"], theme["match_highlight"], 14,
+        )
+
+    def set_style(self, accent_color, text, secondary_text, selected_text, highlight, font_size):
+        """Colours and list font size from the compiled theme, the same ones styled mode uses"""
+        self.font = QFont("Segoe UI")
+        self.font.setPointSize(font_size)
+        self.metrics = QFontMetrics(self.font)
+        self.bold_font = QFont(self.font)
+        self.bold_font.setBold(True)
+        self.bold_metrics = QFontMetrics(self.bold_font)
+        self.row_height = max(self.min_row_height, self.metrics.height() + 16)
+        self.accent = QColor(accent_color)
+        self.text_color = QColor(text)
+        self.secondary_text_color = QColor(secondary_text)
+        self.selected_text_color = QColor(selected_text)
+        self.highlight_color = QColor(highlight)
+        self.trim()
+
+    def trim(self):
+        self.backgrounds = {}
+        self.elided = {}
+
+    def background(self, state, width, height):
+        key = (state, width, height)
+        pixmap = self.backgrounds.get(key)
+        if pixmap is not None:
+            return pixmap
+        if len(self.backgrounds) > 16:
+            self.backgrounds.clear()
+
+        pixmap = QPixmap(width, height)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if state == "selected":
+            gradient = QLinearGradient(0, 0, 0, height)
+            gradient.setColorAt(0, self.accent)
+            gradient.setColorAt(1, self.accent.darker(130))
+            painter.setBrush(QBrush(gradient))
+            painter.setPen(QPen(self.accent.lighter(120), 1))
+        else:
+            fill = QColor(self.accent)
+            fill.setAlphaF(0.12)
+            border = QColor(self.accent)
+            border.setAlphaF(0.3)
+            painter.setBrush(QBrush(fill))
+            painter.setPen(QPen(border, 1))
+        painter.drawRoundedRect(0, 1, width - 1, height - 3, 8, 8)
+        painter.end()
+        self.backgrounds[key] = pixmap
+        return pixmap
+
+    def elide(self, text, width):
+        key = (text, width)
+        elided = self.elided.get(key)
+        if elided is None:
+            if len(self.elided) > 512:
+                self.elided.clear()
+            elided = self.elided[key] = self.metrics.elidedText(text, Qt.TextElideMode.ElideRight, width)
+        return elided
+
+    def paint(self, painter, option, index):
+        rect = option.rect
+        state = option.state
+        data = index.data(Qt.ItemDataRole.UserRole)
+        secondary = isinstance(data, str) and (data == "show_all" or data.startswith("web_search:"))
+        if state & QStyle.StateFlag.State_Selected:
+            painter.drawPixmap(rect.topLeft(), self.background("selected", rect.width(), rect.height()))
+            color = self.selected_text_color
+        elif state & QStyle.StateFlag.State_MouseOver:
+            painter.drawPixmap(rect.topLeft(), self.background("hover", rect.width(), rect.height()))
+            color = self.secondary_text_color if secondary else self.text_color
+        else:
+            color = self.secondary_text_color if secondary else self.text_color
+        painter.setFont(self.font)
+        painter.setPen(color)
+        text_rect = rect.adjusted(12, 0, -12, 0)
+        text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        span = None
+        if self.highlighter is not None and not state & QStyle.StateFlag.State_Selected:
+            span = self.highlighter(data)
+        if span is None or not self.paint_highlight(painter, text_rect, text, span, color):
+            painter.drawText(
+                text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+                self.elide(text, text_rect.width())
+            )
+
+    def paint_highlight(self, painter, rect, text, span, color):
+        """Draw the label with the matched slice in the highlight colour; False when it would need eliding"""
+        start, end = span
+        parts = ((text[:start], self.font, self.metrics, color),
+                 (text[start:end], self.bold_font, self.bold_metrics, self.highlight_color),
+                 (text[end:], self.font, self.metrics, color))
+        if sum(metrics.horizontalAdvance(part) for part, font, metrics, pen in parts) > rect.width():
+            return False
+        x = rect.left()
+        for part, font, metrics, pen in parts:
+            if part:
+                painter.setFont(font)
+                painter.setPen(pen)
+                painter.drawText(
+                    x, rect.top(), rect.right() - x, rect.height(),
+                    Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, part
+                )
+                x += metrics.horizontalAdvance(part)
+        return True
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.row_height)
+
+class PaintTimingMixin:
+    """Records each paintEvent under the "paint" latency category once paint_recorder is set"""
+
+    paint_recorder = None
+    paint_key = "styled"
+
+    def paintEvent(self, event):
+        if self.paint_recorder is None:
+            return super().paintEvent(event)
+        started = time.perf_counter()
+        super().paintEvent(event)
+        self.paint_recorder.record("paint", self.paint_key, elapsed_ms(started))
+
+class ModernListWidget(PaintTimingMixin, QListWidget):
     def __init__(self):
         super().__init__()
         self.setAlternatingRowColors(False)
 
-class SimplexityLauncher(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.settings_manager = SettingsManager()
+class ModernListView(PaintTimingMixin, QListView):
+    paint_key = "expanded styled"
 
-        self.setWindowTitle("Simplexity")
-        self.setWindowFlags(
-            Qt.WindowType.FramelessWindowHint |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.Tool
-        )
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setFixedSize(600, 320)  
+class ResultPageModel(QAbstractListModel):
+    """(label, data) rows pulled from an iterator one page at a time as the view scrolls"""
 
-        screen = QApplication.primaryScreen().availableGeometry()
-        x = (screen.width() - self.width()) // 2
-        y = 100
-        self.move(x, y)
+    def __init__(self, rows=(), source=(), page_size=50, parent=None):
+        super().__init__(parent)
+        self.rows = list(rows)
+        self.source = iter(source)
+        self.page_size = page_size
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        label, data = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return label
+        if role == Qt.ItemDataRole.UserRole:
+            return data
+        if role == Qt.ItemDataRole.SizeHintRole:
+            return QSize(0, 35)
+        return None
 
-        accent_color = self.settings_manager.get("theme_accent_color")
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted
 
-        self.setStyleSheet(f"""
-            QWidget {{
+    def fetchMore(self, parent):
+        if parent.isValid() or self.exhausted:
+            return
+        page = list(islice(self.source, self.page_size))
+        if len(page) < self.page_size:
+            self.exhausted = True
+        if page:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+
+WINDOW_STYLE_TEMPLATE = Template("""
+            QWidget {
                 font-family: 'Segoe UI', Arial, sans-serif;
-                background: rgba(15, 15, 15, 240);
-                border: 2px solid {accent_color};
+                background: $window_background;
+                border: 2px solid $accent;
                 border-radius: 16px;
-            }}
-            QLineEdit {{
+            }
+""")
+
+ENTRY_STYLE_TEMPLATE = Template("""
+            QLineEdit {
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
                     stop:0 
                 color: 
-                font-size: 16px;
+                font-size: ${font_size}px;
                 font-weight: 400;
-                border: 2px solid {accent_color};
+                border: 2px solid $accent;
                 border-radius: 12px;
                 padding: 8px 16px;
                 min-height: 24px;
                 max-height: 24px;
-                selection-background-color: {accent_color};
+                selection-background-color: $accent;
                 selection-color: 
-            }}
-            QLineEdit:focus {{
+            }
+            QLineEdit:focus {
                 border: 2px solid 
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
                     stop:0 
                 box-shadow: 0 0 10px rgba(0, 255, 204, 0.3);
-            }}
-            QListWidget {{
+            }
+""")
+
+LIST_STYLE_TEMPLATE = Template("""
+            QListView {
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 rgba(25, 25, 25, 255), stop:1 rgba(15, 15, 15, 255));
+                    stop:0 $list_top, stop:1 $list_bottom);
                 border: 1px solid 
                 border-radius: 12px;
                 color: 
-                font-size: 14px;
+                font-size: ${list_font_size}px;
                 font-weight: 400;
                 padding: 6px;
                 outline: none;
-            }}
-            QListWidget::item {{
+            }
+            QListView QScrollBar:vertical {
+                background: $scrollbar_background;
+                width: 8px;
+                margin: 0px;
+                border-radius: 4px;
+            }
+            QListView QScrollBar::handle:vertical {
+                background: $accent;
+                min-height: 20px;
+                border-radius: 4px;
+            }
+""")
+
+LIST_ITEM_STYLE_TEMPLATE = Template("""
+            QListView::item {
                 background: transparent;
                 border: 1px solid transparent;
                 border-radius: 8px;
                 padding: 8px 12px;
                 margin: 1px 0px;
                 color: 
-            }}
-            QListWidget::item:hover {{
+            }
+            QListView::item:hover {
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
                     stop:0 rgba(0, 212, 170, 0.15), stop:1 rgba(0, 212, 170, 0.08));
                 border: 1px solid rgba(0, 212, 170, 0.3);
                 color: 
-            }}
-            QListWidget::item:selected {{
+            }
+            QListView::item:selected {
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 {accent_color}, stop:1 
+                    stop:0 $accent, stop:1 
                 border: 1px solid 
                 color: 
                 font-weight: 500;
-            }}
-            QListWidget QScrollBar:vertical {{
-                background: rgba(30, 30, 30, 255);
-                width: 8px;
-                margin: 0px;
-                border-radius: 4px;
-            }}
-            QListWidget QScrollBar::handle:vertical {{
-                background: {accent_color};
-                min-height: 20px;
-                border-radius: 4px;
-            }}
-        """)
+            }
+""")
+
+THEME_COLORS = {
+    True: {
+        "window_background": "rgba(15, 15, 15, 240)",
+        "list_top": "rgba(25, 25, 25, 255)",
+        "list_bottom": "rgba(15, 15, 15, 255)",
+        "scrollbar_background": "rgba(30, 30, 30, 255)",
+        "window": "#0f0f0f",
+        "text": "#e6e6e6",
+        "secondary_text": "#8c8c8c",
+        "selected_text": "#0f0f0f",
+        "match_highlight": "#ffd479",
+    },
+    False: {
+        "window_background": "rgba(245, 245, 245, 240)",
+        "list_top": "rgba(255, 255, 255, 255)",
+        "list_bottom": "rgba(240, 240, 240, 255)",
+        "scrollbar_background": "rgba(225, 225, 225, 255)",
+        "window": "#f5f5f5",
+        "text": "#1e1e1e",
+        "secondary_text": "#6e6e6e",
+        "selected_text": "#ffffff",
+        "match_highlight": "#b35c00",
+    },
+}
+
+THEME_KEYS = (
+    "theme_accent_color", "dark_theme", "font_size", "launcher_opacity",
+    "launcher_width", "launcher_height", "custom_css", "performance_mode",
+)
+
+class ThemeEngine:
+    """Compiles theme settings into stylesheet, palette and geometry artifacts, cached by the settings values"""
+
+    def __init__(self, recorder=None, max_cached=8):
+        self.recorder = recorder
+        self.max_cached = max_cached
+        self.compiled = OrderedDict()
+        self.applied = {}
+
+    def trim(self):
+        while len(self.compiled) > 1:
+            self.compiled.popitem(last=False)
+
+    def compile(self, settings_manager):
+        key = tuple(settings_manager.get(key) for key in THEME_KEYS)
+        artifacts = self.compiled.get(key)
+        if artifacts is not None:
+            self.compiled.move_to_end(key)
+            return artifacts
+
+        settings = dict(zip(THEME_KEYS, key))
+        colors = THEME_COLORS[bool(settings["dark_theme"])]
+        variables = dict(
+            colors,
+            accent=settings["theme_accent_color"],
+            font_size=settings["font_size"],
+            list_font_size=max(settings["font_size"] - 2, 8),
+        )
+        list_style = LIST_STYLE_TEMPLATE.substitute(variables)
+        if not settings["performance_mode"]:
+            list_style += LIST_ITEM_STYLE_TEMPLATE.substitute(variables)
+
+        palette = QPalette()
+        palette.setColor(QPalette.ColorRole.Window, QColor(colors["window"]))
+        palette.setColor(QPalette.ColorRole.WindowText, QColor(colors["text"]))
+        palette.setColor(QPalette.ColorRole.Text, QColor(colors["text"]))
+        palette.setColor(QPalette.ColorRole.Highlight, QColor(settings["theme_accent_color"]))
+
+        artifacts = {
+            "window_style": WINDOW_STYLE_TEMPLATE.substitute(variables) + (settings["custom_css"] or ""),
+            "entry_style": ENTRY_STYLE_TEMPLATE.substitute(variables),
+            "list_style": list_style,
+            "palette": (palette, settings["theme_accent_color"], bool(settings["dark_theme"])),
+            "delegate": (
+                settings["theme_accent_color"], colors["text"], colors["secondary_text"],
+                colors["selected_text"], colors["match_highlight"], variables["list_font_size"],
+            ),
+            "size": (settings["launcher_width"], settings["launcher_height"]),
+            "opacity": settings["launcher_opacity"] / 100,
+        }
+        self.compiled[key] = artifacts
+        if len(self.compiled) > self.max_cached:
+            self.compiled.popitem(last=False)
+        return artifacts
+
+    def apply(self, launcher, settings_manager):
+        artifacts = self.compile(settings_manager)
+        changed = [name for name, value in artifacts.items() if self.applied.get(name) != value]
+        for name in changed:
+            started = time.perf_counter()
+            value = artifacts[name]
+            if name == "window_style":
+                launcher.setStyleSheet(value)
+                launcher.ensurePolished()
+            elif name == "entry_style":
+                launcher.entry.setStyleSheet(value)
+                launcher.entry.ensurePolished()
+            elif name == "list_style":
+                launcher.list_widget.setStyleSheet(value)
+                launcher.list_widget.ensurePolished()
+                launcher.expanded_view.setStyleSheet(value)
+            elif name == "palette":
+                launcher.setPalette(value[0])
+            elif name == "delegate":
+                launcher.result_delegate.set_style(*value)
+                launcher.list_widget.doItemsLayout()
+                launcher.expanded_view.doItemsLayout()
+            elif name == "size":
+                launcher.resize_launcher(*value)
+            elif name == "opacity":
+                launcher.setWindowOpacity(value)
+            if self.recorder is not None:
+                self.recorder.record("style", name, elapsed_ms(started))
+        self.applied = dict(artifacts)
+        return changed
+
+class LaunchSignals(QObject):
+    failed = pyqtSignal(str, str)
+    launched = pyqtSignal(str, float)
+
+class SuggestionSignals(QObject):
+    ready = pyqtSignal(str, object)
+
+class HotkeySignals(QObject):
+    triggered = pyqtSignal()
+    armed = pyqtSignal()
+    disarmed = pyqtSignal()
+
+class MetadataSignals(QObject):
+    resolved = pyqtSignal(object, float)
+
+class SimplexityLauncher(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.settings_manager = SettingsManager()
+        self.memory = None
+        self.configure_memory_diagnostics(baseline=False)
+
+        self.setWindowTitle("Simplexity")
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -876,41 +3277,159 @@ class SimplexityLauncher(QWidget):
         layout.addWidget(self.entry, 0, Qt.AlignmentFlag.AlignTop)
 
         self.list_widget = ModernListWidget()
-        self.list_widget.setFixedHeight(220)
+        self.default_delegate = self.list_widget.itemDelegate()
+        self.result_delegate = ResultItemDelegate(
+            self.settings_manager.get("theme_accent_color"), self.list_widget
+        )
+        self.result_delegate.highlighter = self.highlight_row
         self.list_widget.itemClicked.connect(self.on_item_clicked)
         self.list_widget.installEventFilter(self)
         layout.addWidget(self.list_widget, 0, Qt.AlignmentFlag.AlignTop)
         self.list_widget.setVisible(False)
 
-        self.is_visible = False
-        self.ctrl_pressed = False
+        self.expanded = False
+        self.expanded_model = ResultPageModel()
+        self.expanded_view = ModernListView()
+        self.expanded_view.setUniformItemSizes(True)
+        self.expanded_view.setModel(self.expanded_model)
+        self.expanded_view.clicked.connect(self.on_expanded_clicked)
+        self.expanded_view.installEventFilter(self)
+        layout.addWidget(self.expanded_view, 0, Qt.AlignmentFlag.AlignTop)
+        self.expanded_view.setVisible(False)
 
-        self.all_apps = find_start_menu_apps()
-        self.apps_lower = [(name.lower(), path) for name, path in self.all_apps]
+        self.is_visible = False
 
-        self.builtin_items = [
-            ("settings", "⚙️ Settings", "settings_menu"),
-            ("preferences", "⚙️ Settings", "settings_menu"),
-            ("config", "⚙️ Settings", "settings_menu"),
-            ("options", "⚙️ Settings", "settings_menu"),
-        ]
+        self.metadata_resolver = ShortcutMetadataResolver()
+        self.metadata_signals = MetadataSignals(self)
+        self.metadata_signals.resolved.connect(self.on_metadata_resolved)
+
+        self.search_index = SearchIndex([])
+        self.query_cache = QueryCache()
+        self.usage_history = UsageHistory()
+        self.ranking = RankingStage()
+        self.catalog_dirty = False
+        self.catalog_watcher = CatalogWatcher(catalog_dirs(), self)
+        self.catalog_watcher.changed.connect(self.on_catalog_changed)
+        self.reload_catalog()
+
+        self.settings_dialog = None
+
+        self.commands = CommandRegistry(fallback=self.launch_app)
+        self.register_commands()
+
+        self.suggestions = None
+        self.suggestion_signals = SuggestionSignals(self)
+        self.suggestion_signals.ready.connect(self.show_suggestions)
+        self.configure_search_engines()
+
+        self.latency = LatencyRecorder()
+        self.list_widget.paint_recorder = self.latency
+        self.expanded_view.paint_recorder = self.latency
+        self.theme = ThemeEngine(self.latency)
+        self.apply_theme()
+        self.apply_performance_mode()
+        self.launch_signals = LaunchSignals(self)
+        self.launch_signals.failed.connect(self.on_launch_failed)
+        self.launch_signals.launched.connect(self.on_launched)
+        self.launch_executor = LaunchExecutor(
+            metrics=self.latency,
+            on_error=self.launch_signals.failed.emit,
+            on_launched=self.launch_signals.launched.emit
+        )
 
+        self.prewarmer = LaunchPrewarmer(self.metadata_resolver, self.latency)
+        self.prewarm_path = None
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.setSingleShot(True)
+        self.prewarm_timer.setInterval(300)
+        self.prewarm_timer.timeout.connect(self.prewarm_top_result)
+
+        self.hotkey_backend = None
+        self.hotkey_signals = HotkeySignals(self)
+        self.hotkey_signals.triggered.connect(self.on_hotkey_triggered)
+        self.arm_timer = QTimer(self)
+        self.arm_timer.setSingleShot(True)
+        self.arm_timer.setInterval(250)
+        self.arm_timer.timeout.connect(self.prewarm_launcher)
+        self.hotkey_signals.armed.connect(self.arm_timer.start)
+        self.hotkey_signals.disarmed.connect(self.arm_timer.stop)
         self.setup_hotkey()
         self.create_tray_icon()
+        if self.memory is not None:
+            self.memory.snapshot("startup", self)
+
+        self.idle_state = "warm"
+        self.first_query_state = None
+        self.idle_rss = {}
+        self.idle_trims = 0
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.trim_idle)
+        self.start_idle_timer()
+
+    def register_commands(self):
+        self.commands.register(
+            "settings", "⚙️ Settings", ["settings", "preferences", "config", "options"],
+            lambda text: self.show_settings()
+        )
+        self.commands.register(
+            "quit", "⏻ Quit Simplexity", ["quit", "exit"],
+            lambda text: self.exit_app(), exact=True
+        )
+        self.commands.register(
+            "reload", "🔄 Reload App Index", ["reload index", "reindex", "rescan"],
+            lambda text: self.reload_catalog()
+        )
+        self.commands.register(
+            "clear_history", "🧹 Clear History", ["clear history", "history"],
+            lambda text: self.clear_history(), exact=True
+        )
+        self.commands.register(
+            "theme", "🌓 Toggle Theme", ["theme", "toggle theme", "dark mode", "light mode"],
+            lambda text: self.toggle_theme()
+        )
+        self.commands.register(
+            "stats", "📈 Show Performance Stats", ["stats", "perf"],
+            lambda text: self.print_stats()
+        )
+        self.commands.register(
+            "memory", "🧠 Memory Snapshot", ["memory", "leaks"],
+            lambda text: self.report_memory()
+        )
+        self.commands.register_action("web_search", self.open_web_search)
+        self.commands.register_action("math_result", lambda arg, text: self.copy_math_result(arg))
+
+    def apply_theme(self):
+        changed = self.theme.apply(self, self.settings_manager)
+        if changed and self.settings_manager.get("debug_mode"):
+            print(f"[debug] theme applied: {', '.join(changed)}")
+
+    def resize_launcher(self, width, height):
+        self.setFixedSize(width, height)
+        self.list_widget.setFixedHeight(max(height - 100, 60))
+        self.expanded_view.setFixedHeight(max(height - 100, 60))
+        screen = QApplication.primaryScreen().availableGeometry()
+        self.move(screen.x() + (screen.width() - width) // 2, screen.y() + 100)
 
     def setup_hotkey(self):
-        def on_press(key):
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                self.ctrl_pressed = True
-            elif key == keyboard.Key.space and self.ctrl_pressed:
-                QTimer.singleShot(100, self.toggle_visibility)
-
-        def on_release(key):
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                self.ctrl_pressed = False
+        if self.hotkey_backend is not None:
+            self.hotkey_backend.stop()
+        self.hotkey_spec = hotkey_spec(self.settings_manager)
+        combination, double_tap = self.hotkey_spec
+        try:
+            modifiers, key = parse_hotkey(combination)
+        except ValueError as e:
+            print(f"Invalid hotkey, falling back to Ctrl+Space: {e}")
+            modifiers, key = parse_hotkey("Ctrl+Space")
+        machine = HotkeyStateMachine(
+            modifiers, key, self.hotkey_signals.triggered.emit, double_tap=double_tap,
+            on_arm=self.hotkey_signals.armed.emit, on_disarm=self.hotkey_signals.disarmed.emit
+        )
+        self.hotkey_backend = PynputHotkeyBackend(machine)
+        self.hotkey_backend.start()
 
-        self.listener = keyboard.Listener(on_press=on_press, on_release=on_release)
-        self.listener.start()
+    def on_hotkey_triggered(self):
+        QTimer.singleShot(100, self.toggle_visibility)
 
     def create_tray_icon(self):
         try:
@@ -939,20 +3458,166 @@ class SimplexityLauncher(QWidget):
         self.show_settings()
 
     def exit_app_pystray(self, icon, item):
+        self.exit_app()
+
+    def exit_app(self):
+        self.hotkey_backend.stop()
+        self.launch_executor.shutdown()
+        self.prewarmer.shutdown()
+        if self.suggestions is not None:
+            self.suggestions.stop()
         self.tray_icon.stop()
         QApplication.quit()
 
+    def clear_history(self):
+        self.query_cache.clear()
+        self.latency.clear("launch")
+        self.usage_history.clear()
+        self.rebuild_ranking()
+
+    def toggle_theme(self):
+        self.settings_manager.set("dark_theme", not self.settings_manager.get("dark_theme"))
+        self.apply_theme()
+
+    def print_stats(self):
+        print(f"query cache: {self.query_cache.stats()}")
+        print(self.prewarmer.stats())
+        print(self.idle_report())
+        for category in ("startup", "open", "settings", "style", "launch", "prewarm", "paint"):
+            print(self.latency.report(category))
+
+    def configure_memory_diagnostics(self, baseline=True):
+        enabled = self.settings_manager.get("memory_diagnostics")
+        if enabled and self.memory is None:
+            self.memory = MemoryDiagnostics()
+            self.memory.start()
+            if baseline:
+                self.memory.snapshot("enabled", self)
+        elif not enabled and self.memory is not None:
+            self.memory.stop()
+            self.memory = None
+
+    def report_memory(self):
+        if self.memory is None:
+            print("Memory diagnostics are off, enable them in Settings > Advanced")
+            return
+        self.memory.snapshot(f"snapshot {len(self.memory.snapshots)}", self)
+        print(self.memory.report())
+        if len(self.memory.snapshots) > 2:
+            print(self.memory.report(self.memory.snapshots[0]))
+        self.memory.dump()
+
+    def copy_math_result(self, result):
+        QApplication.clipboard().setText(result)
+        print(f"Copied to clipboard: {result}")
+
     def show_settings(self):
-        settings_dialog = SettingsDialog(self.settings_manager, self)
-        if settings_dialog.exec() == QDialog.DialogCode.Accepted:
+        started = time.perf_counter()
+        if self.settings_dialog is None:
+            self.settings_dialog = SettingsDialog(self.settings_manager, self)
+            open_key = "first_open"
+        else:
+            self.settings_dialog.load_current_settings()
+            open_key = "reopen"
+        QTimer.singleShot(0, lambda: self.latency.record("settings", open_key, elapsed_ms(started)))
+        if self.settings_dialog.exec() == QDialog.DialogCode.Accepted:
 
             self.update_ui_from_settings()
 
     def update_ui_from_settings(self):
+        self.apply_theme()
+        self.apply_performance_mode()
+        self.select_search_view()
+        self.rebuild_ranking()
+        self.configure_search_engines()
+        self.configure_memory_diagnostics()
+        if hotkey_spec(self.settings_manager) != self.hotkey_spec:
+            self.setup_hotkey()
+
+    def apply_performance_mode(self):
+        performance_mode = self.settings_manager.get("performance_mode")
+        self.entry.configure_animation(
+            not performance_mode, self.settings_manager.get("animation_speed")
+        )
+        self.list_widget.setUniformItemSizes(performance_mode)
+        if performance_mode:
+            self.list_widget.setItemDelegate(self.result_delegate)
+            self.expanded_view.setItemDelegate(self.result_delegate)
+            self.list_widget.paint_key = "performance"
+            self.expanded_view.paint_key = "expanded performance"
+        else:
+            self.list_widget.setItemDelegate(self.default_delegate)
+            self.expanded_view.setItemDelegate(self.default_delegate)
+            self.list_widget.paint_key = "styled"
+            self.expanded_view.paint_key = "expanded styled"
+
+    def on_catalog_changed(self):
+        if self.is_visible:
+            self.reload_catalog()
+        else:
+            self.catalog_dirty = True
+
+    def reload_catalog(self):
+        self.catalog_dirty = False
+        self.catalog_watcher.rewatch()
+        self.raw_apps = []
+        canonicalizer = CatalogCanonicalizer(self.metadata_resolver.cached)
+        for name, path in iter_catalog_apps(self.metadata_resolver.store):
+            self.raw_apps.append((name, path))
+            canonicalizer.add(name, path)
+        self.apply_catalog(canonicalizer)
+        self.resolve_metadata()
+
+    def canonicalize_catalog(self):
+        canonicalizer = CatalogCanonicalizer(self.metadata_resolver.cached)
+        for name, path in self.raw_apps:
+            canonicalizer.add(name, path)
+        self.apply_catalog(canonicalizer)
+
+    def apply_catalog(self, canonicalizer):
+        self.all_apps = canonicalizer.apps()
+        self.catalog_aliases = canonicalizer.aliases()
+        self.catalog_unresolved = canonicalizer.unresolved
+        self.search_index.rebuild(self.all_apps, self.catalog_aliases)
+        self.rebuild_ranking()
+        self.search_index.set_metadata({
+            path: metadata for path in self.search_index.paths
+            if (metadata := self.metadata_resolver.cached(path))
+        })
+        if self.settings_manager.get("debug_mode"):
+            print(f"[debug] {canonicalizer.report()}")
+        self.select_search_view()
+
+    def rebuild_ranking(self):
+        self.ranking.rebuild(
+            self.search_index, self.usage_history,
+            self.settings_manager.get("prioritize_recent_apps")
+        )
 
-        accent_color = self.settings_manager.get("theme_accent_color")
+    def resolve_metadata(self):
+        paths = [path for name, path in self.raw_apps]
+        self.metadata_resolver.resolve_all(paths, self.metadata_signals.resolved.emit)
 
-        self.__init__()
+    def on_metadata_resolved(self, metadata, resolve_ms):
+        if any(path in metadata for path in self.catalog_unresolved):
+            self.canonicalize_catalog()
+        else:
+            self.search_index.set_metadata(metadata)
+            self.select_search_view()
+        if self.settings_manager.get("debug_mode"):
+            print(f"[debug] resolved {len(metadata)} shortcuts in {resolve_ms:.0f}ms")
+
+    def select_search_view(self):
+        self.search_view = self.search_index.view(
+            self.settings_manager.get("search_case_sensitive"),
+            self.settings_manager.get("exclude_system_apps")
+        )
+        self.search_view.prepare(
+            self.settings_manager.get("enable_fuzzy_search"),
+            self.settings_manager.get("search_include_descriptions")
+        )
+        if self.settings_manager.get("debug_mode"):
+            print(f"[debug] {self.search_index.build_report(self.search_view)}")
 
     def toggle_visibility(self):
         if not self.isVisible():
@@ -961,14 +3626,22 @@ class SimplexityLauncher(QWidget):
             self.hide_launcher()
 
     def show_launcher(self):
+        started = time.perf_counter()
+        self.idle_timer.stop()
         self.show()
         self.raise_()
         self.activateWindow()
+        self.expanded = False
         self.entry.clear()
         self.list_widget.clear()
         self.list_widget.setVisible(False)
         QTimer.singleShot(50, self.focus_and_prepare_entry)
         self.is_visible = True
+        state = self.first_query_state = self.idle_state
+        self.idle_state = "warm"
+        if self.catalog_dirty:
+            QTimer.singleShot(0, self.reload_catalog)
+        QTimer.singleShot(0, lambda: self.latency.record("open", state, elapsed_ms(started)))
 
     def focus_and_prepare_entry(self):
         self.entry.setFocus(Qt.FocusReason.OtherFocusReason)
@@ -977,103 +3650,345 @@ class SimplexityLauncher(QWidget):
     def hide_launcher(self):
         self.hide()
         self.is_visible = False
+        self.start_idle_timer()
+        self.schedule_prewarm(None)
+        if self.suggestions is not None:
+            self.suggestions.cancel()
 
     def on_enter_pressed(self):
         current_item = self.list_widget.currentItem()
         text = self.entry.text().strip()
 
-        if current_item:
-            data = current_item.data(Qt.ItemDataRole.UserRole)
-            if data == "settings_menu":
-                self.show_settings()
-            elif data == "perplexity_search":
-                self.launch_perplexity_search(text)
-            elif data and data.startswith("math_result:"):
-
-                result = data.replace("math_result:", "")
-                QApplication.clipboard().setText(result)
-                print(f"Copied to clipboard: {result}")
-            else:
-                self.launch_app(data)
+        if self.expanded:
+            index = self.expanded_view.currentIndex()
+            if index.isValid():
+                self.commands.dispatch(index.data(Qt.ItemDataRole.UserRole), text)
+            elif text:
+                self.launch_web_search(text)
+        elif current_item:
+            if current_item.data(Qt.ItemDataRole.UserRole) == "show_all":
+                self.set_expanded(True)
+                return
+            self.commands.dispatch(current_item.data(Qt.ItemDataRole.UserRole), text)
         else:
             if text:
 
-                if is_math_expression(text) and self.settings_manager.get("show_math_calculator"):
-                    result = evaluate_math_expression(text)
+                tokens = tokenize_math(text)
+                if tokens is not None and self.settings_manager.get("show_math_calculator"):
+                    result = evaluate_math_tokens(tokens)
                     if result is not None:
                         QApplication.clipboard().setText(str(result))
                         print(f"Math result copied to clipboard: {result}")
                     else:
-                        self.launch_perplexity_search(text)
+                        self.launch_web_search(text)
                 else:
-                    self.launch_perplexity_search(text)
+                    self.launch_web_search(text)
 
         self.hide_launcher()
 
     def on_item_clicked(self, item: QListWidgetItem):
-        data = item.data(Qt.ItemDataRole.UserRole)
-        text = self.entry.text().strip()
+        if item.data(Qt.ItemDataRole.UserRole) == "show_all":
+            self.set_expanded(True)
+            return
+        self.commands.dispatch(item.data(Qt.ItemDataRole.UserRole), self.entry.text().strip())
+        self.hide_launcher()
 
-        if data == "settings_menu":
-            self.show_settings()
-        elif data == "perplexity_search":
-            self.launch_perplexity_search(text)
-        elif data and data.startswith("math_result:"):
-            result = data.replace("math_result:", "")
-            QApplication.clipboard().setText(result)
-            print(f"Copied to clipboard: {result}")
-        else:
-            self.launch_app(data)
+    def on_expanded_clicked(self, index):
+        self.commands.dispatch(index.data(Qt.ItemDataRole.UserRole), self.entry.text().strip())
         self.hide_launcher()
 
+    def set_expanded(self, expanded):
+        self.expanded = expanded
+        self.on_text_changed(self.entry.text())
+        if not expanded:
+            self.set_expanded_model(ResultPageModel())
+        self.entry.setFocus()
+
+    def set_expanded_model(self, model):
+        selection_model = self.expanded_view.selectionModel()
+        self.expanded_view.setModel(model)
+        self.expanded_model = model
+        if selection_model is not None:
+            selection_model.deleteLater()
+
+    def populate_expanded(self, text_stripped):
+        max_results = self.settings_manager.get("max_results")
+        first_page, total = self.match_apps(text_stripped, max_results)
+        self.set_expanded_model(ResultPageModel(
+            source=self.iter_expanded_rows(text_stripped, first_page, max_results)
+        ))
+        self.expanded_model.fetchMore(QModelIndex())
+        if self.expanded_model.rowCount() > 0:
+            self.expanded_view.setCurrentIndex(self.expanded_model.index(0))
+            self.expanded_view.setVisible(True)
+        else:
+            self.expanded_view.setVisible(False)
+        if self.settings_manager.get("debug_mode"):
+            print(f"[debug] expanded results: {total} candidates, {self.expanded_model.rowCount()} rows loaded")
+
     def launch_app(self, path):
+        self.prewarmer.launched(path)
+        self.hide_launcher()
+        self.launch_executor.open_path(path)
+        self.usage_history.record(path)
+        self.ranking.record(path, *self.usage_history.get(path))
+        self.query_cache.discard(
+            lambda rows: any(data == path or data == "show_all" for label, data in rows)
+        )
+
+    def launch_web_search(self, query, engine=None):
+        if not query:
+            return
+        if engine is None:
+            routed = self.search_engines.route(query)
+            if routed is not None:
+                engine, query = routed
+            elif not self.settings_manager.get("show_perplexity_search"):
+                return
+            else:
+                engine = self.search_engines.default
+        self.hide_launcher()
+        self.launch_executor.open_url(self.search_engines.url(engine, query))
+
+    def open_web_search(self, arg, text):
+        engine, _, query = arg.partition(":")
+        self.launch_web_search(query, engine)
+
+    def configure_search_engines(self):
+        self.search_engines = SearchEngineRouter(
+            self.settings_manager.get("search_web_engine"),
+            self.settings_manager.get("custom_search_engines"),
+        )
+        url = self.settings_manager.get("search_suggestions_url")
+        enabled = self.settings_manager.get("search_suggestions")
+        if self.suggestions is not None and (not enabled or self.suggestions.url != url):
+            self.suggestions.stop()
+            self.suggestions = None
+        if enabled and self.suggestions is None:
+            self.suggestions = SuggestionProvider(url, self.suggestion_signals.ready.emit)
+
+    def request_suggestions(self, text_stripped):
+        if self.suggestions is None:
+            return
+        routed = self.search_engines.route(text_stripped)
+        query = routed[1] if routed else text_stripped
+        suggestions = self.suggestions.request(query)
+        if suggestions is not None:
+            self.show_suggestions(query, suggestions)
+
+    def show_suggestions(self, query, suggestions):
+        text_stripped = self.entry.text().strip()
+        routed = self.search_engines.route(text_stripped)
+        engine, current = routed or (self.search_engines.default, text_stripped)
+        if query != current or self.expanded or not self.is_visible:
+            return
+        for suggestion in suggestions[:3]:
+            if suggestion == query:
+                continue
+            item = QListWidgetItem(f"💡 {suggestion}")
+            item.setData(Qt.ItemDataRole.UserRole, f"web_search:{engine}:{suggestion}")
+            item.setSizeHint(QSize(0, 35))
+            self.list_widget.addItem(item)
+        if self.list_widget.count() > 0 and not self.list_widget.isVisible():
+            self.list_widget.setCurrentRow(0)
+            self.list_widget.setVisible(True)
+        if self.settings_manager.get("debug_mode"):
+            print(f"[debug] suggestions: {self.suggestions.stats()}")
+
+    def on_launch_failed(self, target, message):
+        print(message)
         try:
-            os.startfile(path)
-        except Exception as e:
-            print(f"Couldn't open {path}: {e}")
+            self.tray_icon.notify(message, "Simplexity")
+        except Exception:
+            pass
 
-    def launch_perplexity_search(self, query):
-        if query and self.settings_manager.get("show_perplexity_search"):
-            encoded = urllib.parse.quote_plus(query)
-            url = f"https://www.perplexity.ai/search/new?q={encoded}"
-            webbrowser.open(url)
+    def on_launched(self, target, elapsed_ms):
+        self.prewarmer.record_launch(target, elapsed_ms)
+        if self.settings_manager.get("debug_mode"):
+            print(f"[debug] launched {target} in {elapsed_ms:.1f}ms")
+            print(self.latency.report("launch"))
 
     def on_text_changed(self, text):
+        started = time.perf_counter()
         text_stripped = text.strip()
-        text_lower = text_stripped.lower()
 
         if not text_stripped:
             self.list_widget.clear()
             self.list_widget.setVisible(False)
+            self.expanded_view.setVisible(False)
+            self.schedule_prewarm(None)
             return
 
-        matched_apps = []
-        matched_builtin = []
-        math_result = None
-
-        for keyword, display_name, action in self.builtin_items:
-            if text_lower in keyword:
-                matched_builtin.append((display_name, action))
+        if self.expanded:
+            self.list_widget.clear()
+            self.list_widget.setVisible(False)
+            self.populate_expanded(text_stripped)
+            return
+        self.expanded_view.setVisible(False)
 
-        if (is_math_expression(text_stripped) and 
-            self.settings_manager.get("show_math_calculator")):
-            math_result = evaluate_math_expression(text_stripped)
+        generation = (self.search_index.generation, self.settings_manager.generation,
+                      self.usage_history.generation)
+        rows = self.query_cache.get(text_stripped, generation)
+        if rows is None:
+            rows = self.compute_results(text_stripped)
+            self.query_cache.put(text_stripped, generation, rows)
 
-        max_results = self.settings_manager.get("max_results")
-        for name_lower, path in self.apps_lower:
-            if text_lower in name_lower:
-                matched_apps.append((name_lower, path))
-                if len(matched_apps) >= max_results:
-                    break
+        if self.settings_manager.get("debug_mode"):
+            print(f"[debug] query cache: {self.query_cache.stats()}")
 
         self.list_widget.clear()
-
-        for display_name, action in matched_builtin:
-            item = QListWidgetItem(display_name)
-            item.setData(Qt.ItemDataRole.UserRole, action)
+        for label, data in rows:
+            item = QListWidgetItem(label)
+            item.setData(Qt.ItemDataRole.UserRole, data)
             item.setSizeHint(QSize(0, 35))
             self.list_widget.addItem(item)
 
+        if self.list_widget.count() > 0:
+            self.list_widget.setCurrentRow(0)
+            self.list_widget.setVisible(True)
+        else:
+            self.list_widget.setVisible(False)
+
+        if self.first_query_state is not None:
+            self.latency.record("open", f"{self.first_query_state} first query", elapsed_ms(started))
+            self.first_query_state = None
+        self.schedule_prewarm(rows[0][1] if rows else None)
+        self.request_suggestions(text_stripped)
+
+    def start_idle_timer(self):
+        minutes = self.settings_manager.get("idle_trim_minutes")
+        if minutes and minutes > 0:
+            self.idle_timer.start(minutes * 60000)
+
+    def trim_idle(self):
+        """Release rebuildable caches down to what the first keystroke needs"""
+        if self.is_visible:
+            return
+        self.idle_rss["warm"] = resident_memory()
+        self.query_cache.clear()
+        self.result_delegate.trim()
+        self.theme.trim()
+        self.search_index.trim(self.search_view)
+        self.list_widget.clear()
+        self.set_expanded_model(ResultPageModel())
+        self.prewarmer.invalidate()
+        if self.suggestions is not None:
+            self.suggestions.clear()
+        if self.settings_dialog is not None and not self.settings_dialog.isVisible():
+            self.settings_dialog.deleteLater()
+            self.settings_dialog = None
+        QTimer.singleShot(0, self.finish_trim)
+
+    def finish_trim(self):
+        release_free_heap()
+        self.idle_state = "trimmed"
+        self.idle_trims += 1
+        self.idle_rss["trimmed"] = resident_memory()
+        if self.settings_manager.get("debug_mode"):
+            print(f"[debug] {self.idle_report()}")
+
+    def prewarm_launcher(self):
+        """Hotkey modifiers held without another key: rebuild the trimmed tiers and polish before the launcher shows"""
+        if self.idle_state != "trimmed" or self.is_visible:
+            return
+        self.select_search_view()
+        self.ensurePolished()
+        self.entry.ensurePolished()
+        self.list_widget.ensurePolished()
+        self.idle_state = "prewarmed"
+        self.idle_rss["prewarmed"] = resident_memory()
+        self.start_idle_timer()
+
+    def idle_report(self):
+        parts = [
+            f"{state} {rss / 1048576:.1f}MB" for state, rss in self.idle_rss.items() if rss is not None
+        ]
+        return f"idle: {self.idle_trims} trims, state {self.idle_state}, rss {', '.join(parts) or 'n/a'}"
+
+    def schedule_prewarm(self, data):
+        """Restart the stability timer whenever the top row changes to a different app"""
+        if data is not None and (self.commands.is_action(data) or data == "show_all" or
+                                 not self.settings_manager.get("predictive_prewarm")):
+            data = None
+        if data == self.prewarm_path:
+            return
+        self.prewarm_path = data
+        self.prewarmer.cancel()
+        if data is None:
+            self.prewarm_timer.stop()
+        else:
+            self.prewarm_timer.start()
+
+    def prewarm_top_result(self):
+        if self.prewarm_path is not None and self.is_visible:
+            self.prewarmer.schedule(self.prewarm_path)
+
+    def highlight_row(self, data):
+        """Span of the typed text inside an app row's label, for the performance-mode delegate"""
+        app_id = self.search_index.path_ids.get(data)
+        if app_id is None:
+            return None
+        span = self.search_view.highlight(app_id, self.entry.text().strip())
+        if span is None:
+            return None
+        prefix = len("🚀 ")
+        return span[0] + prefix, span[1] + prefix
+
+    def iter_candidates(self, text_stripped, limit):
+        """Name and initials matches, then the description and typo tiers while still short of `limit`"""
+        view = self.search_view
+        seen = set()
+        for app_id, score in chain(view.iter_name_matches(text_stripped), view.match_initials(text_stripped, ())):
+            seen.add(app_id)
+            yield app_id, score
+        for enabled, tier in (("search_include_descriptions", view.match_descriptions),
+                              ("enable_fuzzy_search", view.match_typos)):
+            if len(seen) < limit and self.settings_manager.get(enabled):
+                for app_id, score in tier(text_stripped, seen, limit - len(seen)):
+                    seen.add(app_id)
+                    yield app_id, score
+
+    def match_candidates(self, text_stripped, limit):
+        """Best score per app over iter_candidates, in the order the tiers found them"""
+        candidates = {}
+        for app_id, score in self.iter_candidates(text_stripped, limit):
+            if score > candidates.get(app_id, 0.0):
+                candidates[app_id] = score
+        return candidates
+
+    def match_apps(self, text_stripped, limit):
+        """Top `limit` ranked apps and the number of candidates they were picked from"""
+        candidates = self.match_candidates(text_stripped, limit)
+        return self.ranking.rank(candidates, limit), len(candidates)
+
+    def iter_expanded_rows(self, text_stripped, first_page, limit):
+        """The ranked first page, then the rest of iter_candidates, matched only as pages are fetched"""
+        names = self.search_index.names
+        paths = self.search_index.paths
+        shown = set()
+        for app_id, score in chain(first_page, self.iter_candidates(text_stripped, limit)):
+            if app_id not in shown:
+                shown.add(app_id)
+                yield f"🚀 {names[app_id]}", paths[app_id]
+
+    def compute_results(self, text_stripped):
+        rows = []
+        math_result = None
+
+        matched_commands = self.commands.lookup(text_stripped)
+
+        if self.settings_manager.get("show_math_calculator"):
+            math_result = evaluate_math_tokens(tokenize_math(text_stripped))
+
+        max_results = self.settings_manager.get("max_results")
+        matched_apps, total = self.match_apps(text_stripped, max_results)
+
+        routed = self.search_engines.route(text_stripped)
+        if routed is not None:
+            engine, query = routed
+            rows.append((f'🔍 Search {self.search_engines.title(engine)}: "{query}"',
+                         f"web_search:{engine}:{query}"))
+
         if math_result is not None:
             result_text = str(math_result)
             if len(result_text) > 50:  
@@ -1085,31 +4000,32 @@ class SimplexityLauncher(QWidget):
                 except:
                     pass
 
-            item = QListWidgetItem(f"📊 {text_stripped} = {result_text}")
-            item.setData(Qt.ItemDataRole.UserRole, f"math_result:{result_text}")
-            item.setSizeHint(QSize(0, 35))
-            self.list_widget.addItem(item)
+            rows.append((f"📊 {text_stripped} = {result_text}", f"math_result:{result_text}"))
 
-        if matched_apps:
-            for name_lower, path in matched_apps:
-                display_name = ' '.join(word.capitalize() for word in name_lower.split())
-                item = QListWidgetItem(f"🚀 {display_name}")
-                item.setData(Qt.ItemDataRole.UserRole, path)
-                item.setSizeHint(QSize(0, 35))
-                self.list_widget.addItem(item)
-
-        if (text_stripped and self.settings_manager.get("show_perplexity_search") and
-            (not math_result or matched_apps or matched_builtin)):
-            item = QListWidgetItem(f'🔍 Ask Perplexity AI: "{text_stripped}"')
-            item.setData(Qt.ItemDataRole.UserRole, "perplexity_search")
-            item.setSizeHint(QSize(0, 35))
-            self.list_widget.addItem(item)
+        ranked = [
+            (self.ranking.score_command(score, command.title), command.title, f"cmd:{command.command_id}")
+            for score, command in matched_commands
+        ]
+        ranked.extend(
+            (score, f"🚀 {self.search_index.names[app_id]}", self.search_index.paths[app_id])
+            for app_id, score in matched_apps
+        )
+        ranked.sort(key=lambda row: row[0], reverse=True)
+        rows.extend((label, data) for score, label, data in ranked)
 
-        if self.list_widget.count() > 0:
-            self.list_widget.setCurrentRow(0)
-            self.list_widget.setVisible(True)
-        else:
-            self.list_widget.setVisible(False)
+        if total > len(matched_apps):
+            rows.append((f"⋯ Show all {total} matches (Tab)", "show_all"))
+
+        if (routed is None and self.settings_manager.get("show_perplexity_search") and
+            (not math_result or matched_apps or matched_commands)):
+            engine = self.search_engines.default
+            if engine == "perplexity":
+                label = f'🔍 Ask Perplexity AI: "{text_stripped}"'
+            else:
+                label = f'🔍 Search {self.search_engines.title(engine)}: "{text_stripped}"'
+            rows.append((label, f"web_search:{engine}:{text_stripped}"))
+
+        return rows
 
     def eventFilter(self, obj, event):
         if obj is self.entry:
@@ -1118,6 +4034,13 @@ class SimplexityLauncher(QWidget):
             elif event.type() == QEvent.Type.KeyPress:
                 if event.key() == Qt.Key.Key_Escape:
                     self.hide_launcher()
+                elif event.key() == Qt.Key.Key_Tab:
+                    self.set_expanded(not self.expanded)
+                    return True
+                elif event.key() in (Qt.Key.Key_Down, Qt.Key.Key_Up) and self.expanded:
+                    if self.expanded_view.isVisible():
+                        self.expanded_view.setFocus()
+                        return True
                 elif event.key() in (Qt.Key.Key_Down, Qt.Key.Key_Up):
                     if self.list_widget.isVisible():
                         self.list_widget.setFocus()
@@ -1126,7 +4049,7 @@ class SimplexityLauncher(QWidget):
                         else:
                             self.list_widget.setCurrentRow(self.list_widget.count() - 1)
                         return True
-        elif obj is self.list_widget:
+        elif obj is self.list_widget or obj is self.expanded_view:
             if event.type() == QEvent.Type.KeyPress:
                 if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
                     self.on_enter_pressed()
@@ -1134,27 +4057,322 @@ class SimplexityLauncher(QWidget):
                 elif event.key() == Qt.Key.Key_Escape:
                     self.hide_launcher()
                     return True
+                elif event.key() == Qt.Key.Key_Tab:
+                    self.set_expanded(not self.expanded)
+                    return True
                 elif event.key() in (Qt.Key.Key_Backspace, Qt.Key.Key_Delete):
                     self.entry.setFocus()
                     return True
         return super().eventFilter(obj, event)
 
     def check_focus(self):
-        if not self.entry.hasFocus() and not self.list_widget.hasFocus():
+        if not (self.entry.hasFocus() or self.list_widget.hasFocus() or self.expanded_view.hasFocus()):
             self.hide_launcher()
 
     def closeEvent(self, event):
         event.ignore()
         self.hide_launcher()
 
+BENCHMARK_SYLLABLES = [
+    "ac", "bel", "cor", "dex", "fin", "gra", "hub", "ion", "jet", "kit", "lum", "mar",
+    "nov", "op", "pix", "quo", "ray", "sol", "tor", "ul", "vis", "wav", "xen", "zed",
+]
+
+def benchmark_names(count, seed=0):
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(1, 3)):
+            word = "".join(rng.choice(BENCHMARK_SYLLABLES) for _ in range(rng.randint(2, 4)))
+            words.append(word.capitalize())
+        names.append(" ".join(words))
+    return names
+
+def make_typo(word, rng):
+    i = rng.randrange(len(word) - 1)
+    edit = rng.choice(("swap", "drop", "replace", "insert"))
+    if edit == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if edit == "drop":
+        return word[:i] + word[i + 1:]
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if edit == "replace":
+        return word[:i] + letter + word[i + 1:]
+    return word[:i] + letter + word[i:]
+
+def benchmark_typo_search(count=20000, queries=500):
+    rng = random.Random(1)
+    names = benchmark_names(count)
+    index = SearchIndex([(name, f"{name}.lnk") for name in names])
+    view = index.view(False, False)
+
+    started = time.perf_counter()
+    view.typo_index = view.build_typo_index()
+    build_ms = (time.perf_counter() - started) * 1000
+
+    hits = 0
+    elapsed = []
+    for _ in range(queries):
+        target = rng.randrange(count)
+        word = max(TOKEN_RE.findall(view.keys[target]), key=len)
+        query = make_typo(word, rng)
+        started = time.perf_counter()
+        matched = view.match_typos(query, set(), 8)
+        elapsed.append((time.perf_counter() - started) * 1000)
+        hits += any(app_id == target for app_id, score in matched)
+    elapsed.sort()
+    print(f"typo search over {count} names, {len(view.typo_index.postings)} tokens")
+    print(f"  token trie build: {build_ms:.0f}ms")
+    print(f"  per query: avg={sum(elapsed) / len(elapsed):.2f}ms "
+          f"p95={elapsed[int(len(elapsed) * 0.95)]:.2f}ms max={elapsed[-1]:.2f}ms")
+    print(f"  target in results: {hits}/{queries} ({hits / queries:.1%})")
+
+def benchmark_hotkey(events=200000):
+    rng = random.Random(2)
+    Key = keyboard.Key
+    keys = [keyboard.KeyCode.from_char(c) for c in "abcdefghijklmnopqrstuvwxyz0123456789"]
+    keys += [Key.shift, Key.backspace, Key.enter, Key.space, Key.ctrl_l, Key.alt_l]
+    stream = [(rng.choice(keys), rng.random() < 0.5) for _ in range(events)]
+
+    triggers = []
+    machine = HotkeyStateMachine(*parse_hotkey("Ctrl+Space"), lambda: triggers.append(1), double_tap="ctrl")
+    backend = PynputHotkeyBackend(machine)
+
+    ctrl_pressed = [False]
+    def legacy_press(key):
+        if key == Key.ctrl_l or key == Key.ctrl_r:
+            ctrl_pressed[0] = True
+        elif key == Key.space and ctrl_pressed[0]:
+            triggers.append(1)
+    def legacy_release(key):
+        if key == Key.ctrl_l or key == Key.ctrl_r:
+            ctrl_pressed[0] = False
+
+    for name, on_press, on_release in (
+        ("compiled", backend.on_press, backend.on_release),
+        ("legacy", legacy_press, legacy_release),
+    ):
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        for key, pressed in stream:
+            if pressed:
+                on_press(key)
+            else:
+                on_release(key)
+        wall_ns = (time.perf_counter() - started) * 1e9 / events
+        cpu_ns = (time.process_time() - cpu_started) * 1e9 / events
+        print(f"hotkey {name}: {wall_ns:.0f}ns wall, {cpu_ns:.0f}ns cpu per event over {events} events")
+
+def benchmark_ranking(sizes=(10000, 100000, 1000000), limit=8):
+    rng = random.Random(3)
+    for size in sizes:
+        static = [rng.random() * 0.5 for _ in range(size)]
+        candidates = {app_id: rng.choice((0.5, 0.8, 1.0)) for app_id in range(size)}
+        for use_numpy in (True, False):
+            if use_numpy and np is None:
+                print(f"ranking {size}: numpy not installed, skipping vectorised path")
+                continue
+            stage = RankingStage(use_numpy=use_numpy)
+            stage.set_static(static)
+            runs = 5
+            started = time.perf_counter()
+            for _ in range(runs):
+                ranked = stage.rank(candidates, limit)
+            per_run = elapsed_ms(started) / runs
+            name = "numpy" if use_numpy else "python"
+            print(f"ranking {size} candidates, top {limit} ({name}): {per_run:.2f}ms")
+
+BENCHMARK_APP_NAMES = [
+    "Google Chrome", "Mozilla Firefox", "Microsoft Edge", "Opera", "Brave", "Notepad", "Notepad++",
+    "Visual Studio Code", "Visual Studio 2022", "PyCharm Community Edition", "IntelliJ IDEA",
+    "Sublime Text", "Android Studio", "Git Bash", "Windows PowerShell", "Command Prompt",
+    "Windows Terminal", "Task Manager", "Control Panel", "Registry Editor", "Paint", "Paint 3D",
+    "Snipping Tool", "Calculator", "Character Map", "Remote Desktop Connection", "Steam",
+    "Epic Games Launcher", "Discord", "Slack", "Microsoft Teams", "Zoom", "Skype", "Telegram",
+    "WhatsApp", "Spotify", "VLC media player", "Audacity", "OBS Studio", "GIMP 2", "Inkscape",
+    "Blender", "Adobe Photoshop 2024", "Adobe Acrobat Reader DC", "Microsoft Word", "Microsoft Excel",
+    "Microsoft PowerPoint", "Microsoft Outlook", "OneNote", "OneDrive", "Dropbox", "7-Zip File Manager",
+    "WinRAR", "FileZilla", "PuTTY", "WinSCP", "VirtualBox", "VMware Workstation 17 Player",
+    "Docker Desktop", "Postman", "Python 3.12 (64-bit)", "IDLE (Python 3.12 64-bit)", "Node.js",
+    "MySQL Workbench 8.0 CE", "pgAdmin 4", "Wireshark", "Unity Hub", "Minecraft Launcher",
+    "Battle.net", "Origin", "GOG Galaxy", "Thunderbird", "KeePassXC", "Bitwarden", "Obsidian",
+    "Notion", "Evernote", "Figma", "LibreOffice Writer", "LibreOffice Calc", "Kdenlive",
+    "HandBrake", "qBittorrent", "CCleaner", "Everything", "PowerToys", "Windows Media Player",
+    "Photos", "Camera", "Settings", "Mail", "Calendar", "Weather", "Maps", "Xbox", "Clock",
+]
+
+def benchmark_math_classifier(expressions=("2+3*4", "sqrt(16)", "sin(pi/2)", "2^10", "-(3-5)*e", "ln(e) + log(100)")):
+    def legacy_is_math(text):
+        if re.search(r'[0-9+\-*/().^]', text):
+            return True
+        return any(func in text.lower() for func in ['sin', 'cos', 'tan', 'sqrt', 'log', 'ln', 'pi', 'e'])
+
+    def legacy_evaluate(expr):
+        expr = expr.replace(' ', '').lower()
+        for old, new in [('pi', str(math.pi)), ('e', str(math.e)), ('sin', 'math.sin'), ('cos', 'math.cos'),
+                         ('tan', 'math.tan'), ('sqrt', 'math.sqrt'), ('log', 'math.log10'),
+                         ('ln', 'math.log'), ('abs', 'abs'), ('^', '**')]:
+            expr = expr.replace(old, new)
+        if not re.match(r'^[0-9+\-*/().mathsincoqrtlgabspie\s]+$', expr):
+            return None
+        try:
+            return eval(expr, {"__builtins__": {}, "math": math, "abs": abs})
+        except:
+            return None
+
+    def legacy(text):
+        return legacy_evaluate(text) if legacy_is_math(text) else None
+
+    def lexer(text):
+        tokens = tokenize_math(text)
+        return evaluate_math_tokens(tokens) if tokens is not None else None
+
+    names = sorted(set(BENCHMARK_APP_NAMES).union(name for name, path in iter_catalog_apps()))
+    keystrokes = [name[:end] for name in names for end in range(1, len(name) + 1)]
+    print(f"math classifier over {len(names)} app names, {len(keystrokes)} keystrokes")
+    for label, classify, run in (("legacy", legacy_is_math, legacy), ("lexer", is_math_expression, lexer)):
+        positives = sum(1 for text in keystrokes if classify(text))
+        shown = sum(1 for text in keystrokes if run(text) is not None)
+        started = time.perf_counter()
+        for text in keystrokes:
+            run(text)
+        per_key = elapsed_ms(started) * 1000 / len(keystrokes)
+        print(f"  {label}: classified as math {positives / len(keystrokes):.1%}, "
+              f"math row shown {shown / len(keystrokes):.1%}, {per_key:.2f}us per keystroke")
+    for expr in expressions:
+        print(f"  {expr} = {evaluate_math_expression(expr)} (legacy {legacy_evaluate(expr)})")
+
+def unicode_variant(name, rng):
+    style = rng.randrange(3)
+    if style == 0:
+        return name.translate(str.maketrans("aeiouAEIOU", "àéîõüÀÉÎÕÜ"))
+    if style == 1:
+        return "".join(chr(ord(c) + 0xFEE0) if c.isascii() and c.isalnum() else c for c in name)
+    return name.replace("ss", "ß").replace("o", "ö")
+
+def benchmark_unicode_keys(count=20000, queries=300):
+    rng = random.Random(4)
+    names = benchmark_names(count, seed=4)
+    variants = set(rng.sample(range(count), count // 5))
+    corpora = {
+        "ascii": names,
+        "unicode": [unicode_variant(name, rng) if i in variants else name for i, name in enumerate(names)],
+    }
+    targets = [rng.randrange(count) for _ in range(queries)]
+    for label, corpus in corpora.items():
+        index = SearchIndex([(name, f"{i}.lnk") for i, name in enumerate(corpus)])
+        started = time.perf_counter()
+        view = index.view(False, False)
+        build_ms = elapsed_ms(started)
+        found = keystrokes = 0
+        started = time.perf_counter()
+        for target in targets:
+            query = names[target].lower()[:8]
+            for end in range(1, len(query) + 1):
+                matched = view.match(query[:end])
+                keystrokes += 1
+            found += any(app_id == target for app_id, score in matched)
+        per_key = elapsed_ms(started) / keystrokes
+        print(f"{label} catalog of {count} names: view build {build_ms:.0f}ms, "
+              f"{per_key:.3f}ms per keystroke, ascii query found target {found}/{queries}")
+
+    started = time.perf_counter()
+    for name in corpora["unicode"]:
+        unicodedata.normalize("NFKC", "".join(
+            c for c in unicodedata.normalize("NFKD", name) if not unicodedata.combining(c)
+        ).casefold())
+    print(f"normalising every entry per keystroke instead would add {elapsed_ms(started):.1f}ms")
+
+class SuggestionStandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a suggestion endpoint, counting requests and connections"""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query).get("q", [""])[0]
+        body = json.dumps([query, [f"{query} {suffix}" for suffix in ("download", "shortcuts", "vs")]]).encode()
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def benchmark_suggestions(server_delay=0.02):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SuggestionStandInHandler)
+    server.daemon_threads = True
+    server.requests = server.connections = 0
+    server.delay = server_delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    ready = {}
+    def on_ready(query, suggestions):
+        ready[query] = time.perf_counter()
+
+    provider = SuggestionProvider(f"http://127.0.0.1:{server.server_address[1]}/complete?q={{query}}", on_ready)
+    rounds = [
+        ("fast typing", "visual studio code", 0.03),
+        ("slow typing", "blender", 0.25),
+        ("retyping", "visual studio code", 0.03),
+    ]
+    for label, text, keystroke_interval in rounds:
+        call_us = []
+        for end in range(1, len(text) + 1):
+            started = time.perf_counter()
+            provider.request(text[:end])
+            call_us.append(elapsed_ms(started) * 1000)
+            time.sleep(keystroke_interval)
+        typed = time.perf_counter()
+        deadline = typed + 2
+        while text not in ready and time.perf_counter() < deadline:
+            time.sleep(0.005)
+        wait_ms = max(0.0, (ready.get(text, typed) - typed) * 1000)
+        print(f"suggestions while {label} {text!r}, {len(text)} keystrokes {keystroke_interval * 1000:.0f}ms apart: "
+              f"request() max {max(call_us):.0f}us, suggestions {wait_ms:.0f}ms after last keystroke")
+        print(f"  server saw {server.requests} requests over {server.connections} connections; {provider.stats()}")
+    provider.stop()
+    server.shutdown()
+    server.server_close()
+
+BENCHMARKS = {
+    "typo": benchmark_typo_search,
+    "hotkey": benchmark_hotkey,
+    "ranking": benchmark_ranking,
+    "math": benchmark_math_classifier,
+    "unicode": benchmark_unicode_keys,
+    "suggest": benchmark_suggestions,
+}
+
+def run_benchmarks(names):
+    for name in names or BENCHMARKS:
+        benchmark = BENCHMARKS.get(name)
+        if benchmark is None:
+            print(f"Unknown benchmark {name!r}, choose from: {', '.join(BENCHMARKS)}")
+            continue
+        benchmark()
+
 def main():
+    if "--benchmark" in sys.argv:
+        run_benchmarks(sys.argv[sys.argv.index("--benchmark") + 1:])
+        return
+
     app = QApplication(sys.argv)
 
     app.setApplicationName("Simplexity")
     app.setApplicationVersion("2.1")
 
+    started = time.perf_counter()
     launcher = SimplexityLauncher()
-    print("Enhanced Simplexity running. Press Ctrl+Space to open.")
+    launcher.latency.record("startup", "launcher", elapsed_ms(started))
+    print(f"Enhanced Simplexity running. Press {launcher.hotkey_spec[0]} to open.")
     print("Features: App search, Math calculator, Web search, Settings")
     print("Type 'settings' to open configuration menu")
     sys.exit(app.exec())